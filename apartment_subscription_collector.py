@@ -13,19 +13,62 @@ import requests
 import pandas as pd
 import openpyxl
 from openpyxl.utils import get_column_letter
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import os
 import sys
 from docx import Document
 from docx.shared import Inches
 import json
-from collections import defaultdict
+from collections import defaultdict, deque
 import re
 import urllib.parse
 import time
+import math
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import sqlite3
+import hashlib
+import socket
+import argparse
+import multiprocessing
+import bisect
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import contextlib
+import cProfile
+import pstats
+import tracemalloc
+import gzip
+
+# 선택 패키지: 설치되어 있으면 더 빠른 JSON 직렬화와 zstd 압축을 사용
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 from bs4 import BeautifulSoup
 import configparser
 
+# 청약홈 분양정보 조회 서비스 기본 URL
+API_BASE_URL = "http://api.odcloud.kr/api/ApplyhomeInfoDetailSvc/v1"
+
+# 다양한 주택 유형별 API 엔드포인트
+HOUSING_APIS = {
+    '아파트': 'getAPTLttotPblancDetail',
+    '오피스텔': 'getOFTLttotPblancDetail',
+    '도시형생활주택': 'getULHLttotPblancDetail',
+    '민간임대': 'getRentLttotPblancDetail',
+    '분양상가': 'getMMLttotPblancDetail'
+}
+
+# 한 페이지당 최대 건수
+PER_PAGE = 100
+
 ###########################
 # 설정 및 초기화
 ###########################
@@ -43,29 +86,75 @@ class Config:
         
         if os.path.exists(config_file):
             config.read(config_file, encoding='utf-8')
-            self.api_key = config.get('API', 'service_key', fallback='')
+            # 여러 개의 키는 쉼표로 구분하여 입력
+            service_keys = config.get('API', 'service_key', fallback='')
+            self.api_keys = [key for key in re.split(r'[,\s]+', service_keys) if key]
+            self.api_key = self.api_keys[0] if self.api_keys else ''
+            self.daily_quota = config.getint('API', 'daily_quota', fallback=40000)
             self.max_pages = config.getint('SETTINGS', 'max_pages', fallback=50)
             self.max_items_per_file = config.getint('SETTINGS', 'max_items_per_file', fallback=10)
             self.output_folder = config.get('PATHS', 'output_folder', fallback='결과물')
+            self.async_collect = config.getboolean('SETTINGS', 'async_collect', fallback=True)
+            self.notice_max_chars = config.getint('SETTINGS', 'notice_max_chars', fallback=NOTICE_MAX_CHARS)
+            self.initial_concurrency = config.getint('RATE', 'initial_concurrency', fallback=2)
+            self.max_concurrency = config.getint('RATE', 'max_concurrency', fallback=8)
+            self.target_latency = config.getfloat('RATE', 'target_latency', fallback=2.0)
+            self.pages_per_shard = config.getint('SHARD', 'pages_per_shard', fallback=5)
+            self.usage_db = config.get('PATHS', 'usage_db', fallback='')
+            self.json_pretty = config.getboolean('OUTPUT', 'json_pretty', fallback=True)
+            self.json_compression = config.get('OUTPUT', 'json_compression', fallback='none')
         else:
             # 기본값 설정
+            self.api_keys = []
             self.api_key = ''
+            self.daily_quota = 40000
             self.max_pages = 50
             self.max_items_per_file = 10
             self.output_folder = '결과물'
+            self.async_collect = True
+            self.notice_max_chars = NOTICE_MAX_CHARS
+            self.initial_concurrency = 2
+            self.max_concurrency = 8
+            self.target_latency = 2.0
+            self.pages_per_shard = 5
+            self.usage_db = ''
+            self.json_pretty = True
+            self.json_compression = 'none'
             self.create_default_config(config_file)
+        
+        # 키별 사용량 기록 파일 (여러 호스트가 할당량을 나눠 쓰려면 공유 경로로 지정)
+        if not self.usage_db:
+            self.usage_db = os.path.join(self.output_folder, 'api_key_usage.sqlite')
     
     def create_default_config(self, config_file):
         """기본 설정 파일 생성"""
         config = configparser.ConfigParser()
         
         config['API'] = {
-            'service_key': '여기에_발급받은_API_키를_입력하세요'
+            'service_key': '여기에_발급받은_API_키를_입력하세요',
+            'daily_quota': '40000'
         }
         
         config['SETTINGS'] = {
             'max_pages': '50',
-            'max_items_per_file': '10'
+            'max_items_per_file': '10',
+            'async_collect': 'true',
+            'notice_max_chars': str(NOTICE_MAX_CHARS)
+        }
+        
+        config['RATE'] = {
+            'initial_concurrency': '2',
+            'max_concurrency': '8',
+            'target_latency': '2.0'
+        }
+        
+        config['SHARD'] = {
+            'pages_per_shard': '5'
+        }
+        
+        config['OUTPUT'] = {
+            'json_pretty': 'true',
+            'json_compression': 'none'
         }
         
         config['PATHS'] = {
@@ -155,35 +244,83 @@ def print_progress_bar(current, total, prefix='Progress', suffix='Complete', len
 # 핵심 데이터 수집 함수들
 ###########################
 
+def parse_housing_row(housing_type, row):
+    """API 응답의 한 행을 한글 필드명의 청약정보 딕셔너리로 변환"""
+    # 접수종료일 확인 (다양한 필드명 고려)
+    end_date = (row.get('RCEPT_ENDDE') or 
+                row.get('SUBSCRPT_RCEPT_ENDDE') or 
+                row.get('RECEPT_ENDDE'))
+    
+    return {
+        '주택유형': housing_type,
+        '주택관리번호': row.get('HOUSE_MANAGE_NO'),
+        '공고번호': row.get('PBLANC_NO'),
+        '주택명': row.get('HOUSE_NM'),
+        '주택구분': row.get('HOUSE_SECD_NM'),
+        '세부구분': row.get('HOUSE_DTL_SECD_NM'),
+        '공급지역': row.get('SUBSCRPT_AREA_CODE_NM'),
+        '모집공고일': row.get('RCRIT_PBLANC_DE'),
+        '접수시작일': row.get('RCEPT_BGNDE'),
+        '접수종료일': end_date,
+        '계약시작일': row.get('CNTRCT_CNCLS_BGNDE'),
+        '계약종료일': row.get('CNTRCT_CNCLS_ENDDE'),
+        '문의처 전화번호': row.get('MDHS_TELNO'),
+        '공급위치 주소': row.get('HSSPLY_ADRES'),
+        '사업주체명': row.get('BSNS_MBY_NM'),
+        '시공사명': row.get('CNSTRCT_ENTRPS_NM'),
+        '입주예정월': row.get('MVN_PREARNGE_YM'),
+        '분양가 상한제 여부': row.get('PARCPRC_ULS_AT'),
+        '투기과열지구 여부': row.get('SPECLT_RDN_EARTH_AT'),
+        '홈페이지 주소': row.get('HMPG_ADRES'),
+        '모집공고 상세 URL': row.get('PBLANC_URL'),
+        '당첨자 발표일': row.get('PRZWNER_PRESNATN_DE'),
+        '일반공급 접수 시작일': row.get('GNRL_RCEPT_BGNDE'),
+        '일반공급 접수 종료일': row.get('GNRL_RCEPT_ENDDE'),
+        '총 공급세대수': row.get('TOT_SUPLY_HSHLDCO'),
+        '모델번호': row.get('MODEL_NO'),
+        '전용면적': row.get('EXCLUSE_AR'),
+        '공급금액 (분양최고급액)': row.get('SUPLY_AMOUNT'),
+        '청약신청금': row.get('SUBSCRPT_REQST_AMOUNT'),
+        '주택형': row.get('HOUSE_TY'),
+        '청약접수 시작일': row.get('SUBSCRPT_RCEPT_BGNDE'),
+        '청약접수 종료일': row.get('SUBSCRPT_RCEPT_ENDDE')
+    }
+
+def normalize_date(value):
+    """'YYYY-MM-DD' 또는 'YYYYMMDD' 형식의 날짜를 'YYYY-MM-DD'로 변환 (날짜가 아니면 None)"""
+    match = re.fullmatch(r'(\d{4})-?(\d{2})-?(\d{2})', str(value or '').strip())
+    return '-'.join(match.groups()) if match else None
+
+def is_open_subscription(item, today):
+    """접수종료일이 오늘 이후인(기한이 지나지 않은) 청약인지 확인 (날짜 형식은 normalize_date로 통일)"""
+    end_date = normalize_date(item.get('접수종료일'))
+    return bool(end_date) and end_date >= today
+
 def get_all_housing_data(service_key, max_pages=None):
     """
     모든 주택 유형의 청약 분양정보를 수집하는 함수 (기한이 지나지 않은 것만)
     
     Args:
-        service_key (str): 공공데이터포털에서 발급받은 API 키
+        service_key (str | list | ApiKeyPool): 공공데이터포털에서 발급받은 API 키, 키 목록 또는 키 풀
+            (여러 키는 요청마다 번갈아 사용하며 키별 일일 할당량을 지킴)
         max_pages (int, optional): 각 API별 최대 페이지 수 제한 (None이면 모든 데이터)
     
     Returns:
         list: 모든 주택 유형의 청약 분양정보 리스트
     """
     
-    # URL 인코딩된 키인 경우 디코딩
-    decoded_key = urllib.parse.unquote(service_key)
+    # URL 인코딩된 키는 키 풀에서 디코딩
+    key_pool = service_key if isinstance(service_key, ApiKeyPool) else ApiKeyPool(service_key)
     
     # 다양한 주택 유형별 API 엔드포인트
-    housing_apis = {
-        '아파트': 'getAPTLttotPblancDetail',
-        '오피스텔': 'getOFTLttotPblancDetail',
-        '도시형생활주택': 'getULHLttotPblancDetail',
-        '민간임대': 'getRentLttotPblancDetail',
-        '분양상가': 'getMMLttotPblancDetail'
-    }
+    housing_apis = HOUSING_APIS
     
     all_data = []
     today = datetime.now().strftime('%Y-%m-%d')
     
     print("🏠 모든 주택 유형의 청약정보 수집을 시작합니다...")
-    print(f"🔑 사용 API 키: {decoded_key[:20]}{'...' if len(decoded_key) > 20 else ''}")
+    print(f"🔑 사용 API 키: {ApiKeyPool.mask(key_pool.keys[0])}"
+          f"{f' 외 {len(key_pool.keys) - 1}개' if len(key_pool.keys) > 1 else ''}")
     print("📅 기한이 지나지 않은 청약만 수집합니다")
     print("🏗️ 수집 대상: 아파트, 오피스텔, 도시형생활주택, 민간임대, 분양상가")
     print("=" * 80)
@@ -195,22 +332,33 @@ def get_all_housing_data(service_key, max_pages=None):
         current_api += 1
         print(f"\n🏠 [{current_api}/{total_apis}] {housing_type} 청약정보 수집 중...")
         
-        base_url = f"http://api.odcloud.kr/api/ApplyhomeInfoDetailSvc/v1/{api_endpoint}"
+        base_url = f"{API_BASE_URL}/{api_endpoint}"
         page = 1
         housing_data = []
         
         while True:
+            try:
+                request_key = key_pool.acquire()
+            except QuotaExhaustedError as e:
+                print(f"❌ {housing_type} {page}페이지: {str(e)}")
+                break
+            
             # API 요청 파라미터 정리
             params = {
-                'serviceKey': decoded_key,
+                'serviceKey': request_key,
                 'page': page,
-                'perPage': 100,  # 한 페이지당 최대 100건
+                'perPage': PER_PAGE,  # 한 페이지당 최대 100건
                 'returnType': 'json'
             }
             
             try:
                 response = requests.get(base_url, params=params, timeout=30)
                 
+                if is_quota_exceeded(response):
+                    print(f"⚠️ API 키 할당량 초과: {ApiKeyPool.mask(request_key)} - 다른 키로 재시도합니다.")
+                    key_pool.mark_exhausted(request_key)
+                    continue
+                
                 if response.status_code == 200:
                     try:
                         data = response.json()
@@ -223,53 +371,16 @@ def get_all_housing_data(service_key, max_pages=None):
                         
                         # 데이터 정리 및 기한 필터링
                         for row in page_data:
-                            # 접수종료일 확인 (다양한 필드명 고려)
-                            end_date = (row.get('RCEPT_ENDDE') or 
-                                      row.get('SUBSCRPT_RCEPT_ENDDE') or 
-                                      row.get('RECEPT_ENDDE'))
+                            housing_info = parse_housing_row(housing_type, row)
                             
                             # 기한이 지나지 않은 청약만 포함
-                            if end_date and end_date >= today:
-                                housing_info = {
-                                    '주택유형': housing_type,
-                                    '주택관리번호': row.get('HOUSE_MANAGE_NO'),
-                                    '공고번호': row.get('PBLANC_NO'),
-                                    '주택명': row.get('HOUSE_NM'),
-                                    '주택구분': row.get('HOUSE_SECD_NM'),
-                                    '세부구분': row.get('HOUSE_DTL_SECD_NM'),
-                                    '공급지역': row.get('SUBSCRPT_AREA_CODE_NM'),
-                                    '모집공고일': row.get('RCRIT_PBLANC_DE'),
-                                    '접수시작일': row.get('RCEPT_BGNDE'),
-                                    '접수종료일': end_date,
-                                    '계약시작일': row.get('CNTRCT_CNCLS_BGNDE'),
-                                    '계약종료일': row.get('CNTRCT_CNCLS_ENDDE'),
-                                    '문의처 전화번호': row.get('MDHS_TELNO'),
-                                    '공급위치 주소': row.get('HSSPLY_ADRES'),
-                                    '사업주체명': row.get('BSNS_MBY_NM'),
-                                    '시공사명': row.get('CNSTRCT_ENTRPS_NM'),
-                                    '입주예정월': row.get('MVN_PREARNGE_YM'),
-                                    '분양가 상한제 여부': row.get('PARCPRC_ULS_AT'),
-                                    '투기과열지구 여부': row.get('SPECLT_RDN_EARTH_AT'),
-                                    '홈페이지 주소': row.get('HMPG_ADRES'),
-                                    '모집공고 상세 URL': row.get('PBLANC_URL'),
-                                    '당첨자 발표일': row.get('PRZWNER_PRESNATN_DE'),
-                                    '일반공급 접수 시작일': row.get('GNRL_RCEPT_BGNDE'),
-                                    '일반공급 접수 종료일': row.get('GNRL_RCEPT_ENDDE'),
-                                    '총 공급세대수': row.get('TOT_SUPLY_HSHLDCO'),
-                                    '모델번호': row.get('MODEL_NO'),
-                                    '전용면적': row.get('EXCLUSE_AR'),
-                                    '공급금액 (분양최고급액)': row.get('SUPLY_AMOUNT'),
-                                    '청약신청금': row.get('SUBSCRPT_REQST_AMOUNT'),
-                                    '주택형': row.get('HOUSE_TY'),
-                                    '청약접수 시작일': row.get('SUBSCRPT_RCEPT_BGNDE'),
-                                    '청약접수 종료일': row.get('SUBSCRPT_RCEPT_ENDDE')
-                                }
+                            if is_open_subscription(housing_info, today):
                                 housing_data.append(housing_info)
                         
                         print(f"✅ {housing_type} {page}페이지: {len(page_data)}건 수집 완료 (진행중: {len([h for h in housing_data if h['주택유형'] == housing_type])}건)")
                         
                         # 다음 페이지가 없거나 max_pages 제한에 도달하면 종료
-                        if len(page_data) < 100 or (max_pages and page >= max_pages):
+                        if len(page_data) < PER_PAGE or (max_pages and page >= max_pages):
                             break
                         
                         page += 1
@@ -320,78 +431,1458 @@ def get_all_housing_data(service_key, max_pages=None):
     
     return all_data
 
-def fetch_recruitment_notice_content(url, max_retries=3):
-    """모집공고 상세 페이지에서 공고문 내용을 크롤링"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+# 모집공고 페이지 요청 헤더
+NOTICE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# 공고문 최대 글자 수 (기본값)
+NOTICE_MAX_CHARS = 50000
+
+# 표/본문 영역에서 추출한 내용이 이보다 짧으면 body 전체에서 추출
+NOTICE_MIN_SECTION_CHARS = 200
+
+# 공고문 본문으로 사용하는 div 클래스
+NOTICE_CONTENT_CLASSES = ['content', 'detail-content', 'notice-content']
+
+# 연속 공백(줄바꿈 포함) 정리용 정규식
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+class NoticeTextBuffer:
+    """
+    공백을 정리하며 글자 수 제한까지만 텍스트 조각을 모으는 버퍼
+    
+    조각마다 연속 공백을 한 칸으로 바꾸고 조각 경계의 공백도 합치므로,
+    전체를 이어 붙인 뒤 정리한 결과와 같으면서 제한을 넘는 부분은 만들지 않습니다.
+    """
+    
+    # 긴 조각은 이 크기 단위로 나누어 정리 (제한에 도달하면 나머지는 건너뜀)
+    CHUNK_SIZE = 4096
+    
+    def __init__(self, max_chars=NOTICE_MAX_CHARS):
+        self.max_chars = max_chars
+        self.parts = []
+        self.length = 0
+        self._ends_with_space = False
+    
+    @property
+    def full(self):
+        """글자 수 제한에 도달했는지 여부"""
+        return self.length >= self.max_chars
+    
+    def add(self, text):
+        """텍스트 조각을 공백 정리 후 추가"""
+        for start in range(0, len(text), self.CHUNK_SIZE):
+            if self.full:
+                return
+            chunk = WHITESPACE_PATTERN.sub(' ', text[start:start + self.CHUNK_SIZE])
+            if self._ends_with_space and chunk.startswith(' '):
+                chunk = chunk[1:]
+            if chunk:
+                self.parts.append(chunk)
+                self.length += len(chunk)
+                self._ends_with_space = chunk.endswith(' ')
+    
+    def getvalue(self):
+        """모은 텍스트를 글자 수 제한에 맞춰 반환"""
+        return ''.join(self.parts)[:self.max_chars]
+
+def _iter_notice_fragments(soup):
+    """공고문 표의 행과 본문 div 텍스트를 (조각, 새 구역 시작 여부)로 순서대로 생성"""
+    # 주요 정보 테이블들 (표 하나가 한 구역, 셀이 2개 이상인 행만)
+    for table in soup.find_all('table'):
+        first_row = True
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                yield ' | '.join(cell.get_text(strip=True) for cell in cells), first_row
+                first_row = False
+    
+    # 본문 div (의미있는 내용만)
+    for div in soup.find_all('div', class_=NOTICE_CONTENT_CLASSES):
+        text = div.get_text(strip=True)
+        if len(text) > 50:
+            yield text, True
+
+def extract_notice_text_from_soup(soup, max_chars=NOTICE_MAX_CHARS):
+    """
+    파싱된 모집공고 페이지에서 공고문 텍스트를 추출
     
+    표와 본문 영역의 텍스트를 조각 단위로 공백 정리하며 모으고, max_chars에 도달하면
+    나머지 영역은 읽지 않습니다. 표/본문 내용이 너무 짧으면 body 전체 텍스트를 사용합니다.
+    """
+    text = NoticeTextBuffer(max_chars)
+    # 구역은 빈 줄, 표의 행은 줄바꿈으로 이었을 때의 원문 길이 (body 대체 여부 판단용)
+    section_chars = 0
+    
+    for fragment, new_section in _iter_notice_fragments(soup):
+        if section_chars:
+            section_chars += 2 if new_section else 1
+            text.add('\n')
+        section_chars += len(fragment)
+        text.add(fragment)
+        if text.full and section_chars >= NOTICE_MIN_SECTION_CHARS:
+            break
+    
+    if section_chars < NOTICE_MIN_SECTION_CHARS:
+        body = soup.find('body')
+        if body:
+            text = NoticeTextBuffer(max_chars)
+            for i, string in enumerate(body.stripped_strings):
+                if i:
+                    text.add('\n')
+                text.add(string)
+                if text.full:
+                    break
+    
+    return text.getvalue()
+
+def extract_notice_text(html, max_chars=NOTICE_MAX_CHARS):
+    """모집공고 HTML에서 공고문 본문 텍스트를 추출 (최대 max_chars자)"""
+    return extract_notice_text_from_soup(BeautifulSoup(html, 'html.parser'), max_chars)
+
+def fetch_recruitment_notice_content(url, max_retries=3, max_chars=NOTICE_MAX_CHARS):
+    """모집공고 상세 페이지에서 공고문 내용을 크롤링"""
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = requests.get(url, headers=NOTICE_HEADERS, timeout=30)
             response.raise_for_status()
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 공고문 내용 추출 (청약홈 사이트 구조에 따라)
-            content_sections = []
+            return extract_notice_text(response.text, max_chars)
             
-            # 주요 정보 테이블들 추출
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                table_content = []
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        cell_texts = [cell.get_text(strip=True) for cell in cells]
-                        table_content.append(' | '.join(cell_texts))
-                
-                if table_content:
-                    content_sections.append('\n'.join(table_content))
+        except Exception as e:
+            if attempt < max_retries - 1:
+                time.sleep(2)
+            else:
+                return f"크롤링 실패: {str(e)}"
+    
+    return "크롤링 실패: 최대 재시도 횟수 초과"
+
+###########################
+# API 키 풀 및 할당량 관리
+###########################
+
+# 일일 할당량 초과 시 공공데이터포털이 돌려주는 오류 코드
+QUOTA_EXCEEDED_MARKER = 'LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS'
+
+class QuotaExhaustedError(Exception):
+    """모든 API 키의 일일 할당량이 소진되었을 때 발생"""
+
+class ApiKeyPool:
+    """
+    여러 API 키를 번갈아 사용하며 키별 일일 사용량을 관리하는 키 풀
+    
+    usage_db를 지정하면 사용량을 SQLite 파일에 키별·날짜별로 기록하므로,
+    여러 워커 프로세스나 공유 파일시스템을 쓰는 여러 호스트가 같은 할당량을 나눠 씁니다.
+    """
+    
+    def __init__(self, service_keys, daily_quota=40000, usage_db=None):
+        if isinstance(service_keys, str):
+            service_keys = [service_keys]
+        self.keys = [urllib.parse.unquote(key) for key in service_keys]
+        self.daily_quota = daily_quota
+        self.usage_db = usage_db
+        self._lock = threading.Lock()
+        self._next = 0
+        self._exhausted = set()
+        self._local_usage = defaultdict(int)
+        self._conn = None
+    
+    @staticmethod
+    def _key_id(key):
+        """사용량 기록용 키 식별자 (키 원문은 저장하지 않음)"""
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+    
+    @staticmethod
+    def mask(key):
+        """화면 출력용으로 키 앞부분만 표시"""
+        return f"{key[:20]}{'...' if len(key) > 20 else ''}"
+    
+    def _connect(self):
+        """사용량 DB 연결 (최초 호출 시 테이블 생성)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.usage_db)), exist_ok=True)
+            self._conn = sqlite3.connect(self.usage_db, timeout=60, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS key_usage ('
+                    'key_id TEXT NOT NULL, day TEXT NOT NULL, used INTEGER NOT NULL DEFAULT 0, '
+                    'PRIMARY KEY (key_id, day))'
+                )
+        return self._conn
+    
+    def _claim(self, key, day):
+        """할당량이 남아 있으면 오늘 사용량을 1 늘리고 True 반환"""
+        if not self.usage_db:
+            if self._local_usage[(key, day)] >= self.daily_quota:
+                return False
+            self._local_usage[(key, day)] += 1
+            return True
+        
+        conn = self._connect()
+        key_id = self._key_id(key)
+        with conn:
+            conn.execute('INSERT OR IGNORE INTO key_usage (key_id, day, used) VALUES (?, ?, 0)',
+                         (key_id, day))
+            cursor = conn.execute(
+                'UPDATE key_usage SET used = used + 1 WHERE key_id = ? AND day = ? AND used < ?',
+                (key_id, day, self.daily_quota)
+            )
+        return cursor.rowcount == 1
+    
+    def acquire(self):
+        """
+        할당량이 남은 키를 라운드 로빈으로 골라 사용량 1건을 차감하고 반환
+        
+        Raises:
+            QuotaExhaustedError: 모든 키의 오늘 할당량이 소진된 경우
+        """
+        day = datetime.now().strftime('%Y-%m-%d')
+        with self._lock:
+            for _ in range(len(self.keys)):
+                key = self.keys[self._next % len(self.keys)]
+                self._next += 1
+                if (key, day) in self._exhausted:
+                    continue
+                if self._claim(key, day):
+                    return key
+                self._exhausted.add((key, day))
+        raise QuotaExhaustedError("모든 API 키의 일일 할당량이 소진되었습니다.")
+    
+    def mark_exhausted(self, key):
+        """서버가 할당량 초과를 알린 키를 오늘 하루 사용하지 않도록 표시"""
+        day = datetime.now().strftime('%Y-%m-%d')
+        with self._lock:
+            self._exhausted.add((key, day))
+            if not self.usage_db:
+                self._local_usage[(key, day)] = self.daily_quota
+                return
+            conn = self._connect()
+            with conn:
+                conn.execute('INSERT OR REPLACE INTO key_usage (key_id, day, used) VALUES (?, ?, ?)',
+                             (self._key_id(key), day, self.daily_quota))
+    
+    def usage_summary(self):
+        """키별 오늘 사용량 [(마스킹된 키, 사용량, 할당량), ...] 반환"""
+        day = datetime.now().strftime('%Y-%m-%d')
+        summary = []
+        with self._lock:
+            for key in self.keys:
+                if self.usage_db:
+                    row = self._connect().execute(
+                        'SELECT used FROM key_usage WHERE key_id = ? AND day = ?',
+                        (self._key_id(key), day)
+                    ).fetchone()
+                    used = row[0] if row else 0
+                else:
+                    used = self._local_usage[(key, day)]
+                summary.append((self.mask(key), used, self.daily_quota))
+        return summary
+
+def is_quota_exceeded(response):
+    """응답이 일일 할당량 초과 오류인지 확인"""
+    return QUOTA_EXCEEDED_MARKER in response.text[:1000]
+
+###########################
+# 비동기 수집 및 적응형 속도 제어
+###########################
+
+class AdaptiveRateController:
+    """
+    AIMD(가산 증가/승산 감소) 방식의 동시 요청 수 제어기
+    
+    응답이 빠르고 오류가 적으면 동시 요청 수를 조금씩 늘리고,
+    429/5xx/타임아웃이 발생하면 절반으로 줄인 뒤 잠시 요청을 멈춥니다.
+    """
+    
+    def __init__(self, name, initial=2, minimum=1, maximum=8, target_latency=2.0,
+                 decrease_factor=0.5, max_error_rate=0.1, window=20,
+                 base_backoff=1.0, max_backoff=60.0):
+        self.name = name
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.max_error_rate = max_error_rate
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self.total_requests = 0
+        self.total_errors = 0
+        self._outcomes = deque(maxlen=window)
+        self._backoff = base_backoff
+        self._resume_at = 0.0
+        self._last_decrease = 0.0
+        self._condition = None
+        self._loop = None
+    
+    def _get_condition(self):
+        """현재 이벤트 루프용 Condition 반환 (asyncio.run을 여러 번 호출해도 안전하도록)"""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+    
+    async def acquire(self):
+        """요청 슬롯을 얻을 때까지 대기"""
+        condition = self._get_condition()
+        async with condition:
+            while True:
+                delay = self._resume_at - time.monotonic()
+                if delay <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout=delay if delay > 0 else None)
+                except asyncio.TimeoutError:
+                    pass
+    
+    async def release(self, latency, outcome, retry_after=None):
+        """
+        요청 결과를 반영하여 동시 요청 수를 조정
+        
+        Args:
+            latency (float): 요청 소요 시간(초)
+            outcome (str): 'ok'(정상), 'throttle'(429/5xx/타임아웃), 'skip'(혼잡과 무관한 실패)
+            retry_after (float, optional): 서버가 알려준 재시도 대기 시간(초)
+        """
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            now = time.monotonic()
             
-            # div 내용들도 추출
-            content_divs = soup.find_all('div', class_=['content', 'detail-content', 'notice-content'])
-            for div in content_divs:
-                text = div.get_text(strip=True)
-                if len(text) > 50:  # 의미있는 내용만
-                    content_sections.append(text)
+            if outcome == 'ok':
+                self.total_requests += 1
+                self._outcomes.append(False)
+                error_rate = sum(self._outcomes) / len(self._outcomes)
+                if latency <= self.target_latency and error_rate <= self.max_error_rate:
+                    # 가산 증가: 현재 동시 요청 수만큼 성공하면 약 1 증가
+                    self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+                    self.peak_limit = max(self.peak_limit, self.limit)
+                    self._backoff = self.base_backoff
+                elif latency > self.target_latency * 2:
+                    self._decrease(now)
+            elif outcome == 'throttle':
+                self.total_requests += 1
+                self.total_errors += 1
+                self._outcomes.append(True)
+                if self._decrease(now):
+                    # 서버가 회복할 시간을 주기 위해 잠시 모든 요청을 멈춤
+                    # (같은 혼잡 구간의 나머지 신호로 대기 시간이 계속 늘어나지 않도록 구간당 한 번만 증가)
+                    pause = max(retry_after or 0, self._backoff)
+                    self._backoff = min(self.max_backoff, self._backoff * 2)
+                else:
+                    pause = retry_after or 0
+                self._resume_at = max(self._resume_at, now + pause)
             
-            # 전체 텍스트가 너무 짧으면 body 전체에서 추출
-            full_content = '\n\n'.join(content_sections)
-            if len(full_content) < 200:
-                body = soup.find('body')
-                if body:
-                    full_content = body.get_text(separator='\n', strip=True)
+            condition.notify_all()
+    
+    def _decrease(self, now):
+        """승산 감소 (한 번의 혼잡 구간에서 여러 번 줄이지 않도록 제한, 실제로 줄였으면 True)"""
+        if now - self._last_decrease >= self.target_latency:
+            self.limit = max(self.minimum, self.limit * self.decrease_factor)
+            self._last_decrease = now
+            return True
+        return False
+
+def _parse_retry_after(response):
+    """Retry-After 헤더를 초 단위 숫자로 변환 (없거나 형식이 다르면 None)"""
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+async def fetch_with_rate_control(controller, executor, url, max_retries=3, **kwargs):
+    """
+    속도 제어기를 거쳐 GET 요청을 수행
+    
+    429/5xx 응답과 타임아웃/연결 오류는 혼잡 신호로 제어기에 알리고 재시도합니다.
+    
+    Returns:
+        requests.Response: 마지막 시도의 응답
+    
+    Raises:
+        requests.exceptions.RequestException: 모든 시도가 네트워크 오류로 실패한 경우
+    """
+    loop = asyncio.get_running_loop()
+    kwargs.setdefault('timeout', 30)
+    request = functools.partial(requests.get, url, **kwargs)
+    response = None
+    last_error = None
+    
+    for attempt in range(max_retries):
+        await controller.acquire()
+        started = time.monotonic()
+        try:
+            response = await loop.run_in_executor(executor, request)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            await controller.release(time.monotonic() - started, 'throttle')
+            last_error = e
+            continue
+        except BaseException:
+            await controller.release(time.monotonic() - started, 'skip')
+            raise
+        
+        latency = time.monotonic() - started
+        if response.status_code == 429 or response.status_code >= 500:
+            await controller.release(latency, 'throttle', _parse_retry_after(response))
+            continue
+        
+        await controller.release(latency, 'ok')
+        return response
+    
+    if response is not None:
+        return response
+    raise last_error
+
+class AsyncHousingCollector:
+    """
+    asyncio 기반 청약정보 수집기
+    
+    API 페이지 요청과 모집공고문 크롤링을 각각 AdaptiveRateController로 조절하여
+    고정된 대기 시간 없이 서버 상태에 맞는 속도로 수집합니다.
+    """
+    
+    def __init__(self, key_pool, initial_concurrency=2, max_concurrency=8, target_latency=2.0,
+                 notice_max_chars=NOTICE_MAX_CHARS):
+        if not isinstance(key_pool, ApiKeyPool):
+            key_pool = ApiKeyPool(key_pool)
+        self.key_pool = key_pool
+        self.notice_max_chars = notice_max_chars
+        self.max_concurrency = max_concurrency
+        self.api_rate = AdaptiveRateController(
+            'API', initial=initial_concurrency, maximum=max_concurrency,
+            target_latency=target_latency
+        )
+        self.notice_rate = AdaptiveRateController(
+            '모집공고문', initial=initial_concurrency, maximum=max_concurrency,
+            target_latency=target_latency
+        )
+    
+    @classmethod
+    def from_config(cls, config):
+        """Config 객체의 설정값으로 수집기 생성"""
+        key_pool = ApiKeyPool(config.api_keys, config.daily_quota, config.usage_db)
+        return cls(key_pool, config.initial_concurrency,
+                   config.max_concurrency, config.target_latency, config.notice_max_chars)
+    
+    async def fetch_page(self, executor, housing_type, api_endpoint, page, per_page=PER_PAGE, max_retries=3):
+        """
+        API 한 페이지를 요청하여 응답 JSON을 반환 (실패 시 None)
+        
+        매 요청마다 키 풀에서 키를 받아 사용하며, 할당량이 초과된 키는 제외하고 다른 키로 다시 요청합니다.
+        키 풀의 사용량 기록은 SQLite 잠금을 기다릴 수 있으므로, 이벤트 루프를 막지 않고
+        HTTP 요청용 스레드도 차지하지 않도록 asyncio 기본 executor에서 실행합니다.
+        """
+        loop = asyncio.get_running_loop()
+        url = f"{API_BASE_URL}/{api_endpoint}"
+        response = None
+        last_error = None
+        attempts = 0
+        
+        while attempts < max_retries:
+            try:
+                service_key = await loop.run_in_executor(None, self.key_pool.acquire)
+            except QuotaExhaustedError as e:
+                print(f"❌ {housing_type} {page}페이지: {str(e)}")
+                return None
             
-            # 텍스트 정리
-            full_content = re.sub(r'\n\s*\n', '\n\n', full_content)  # 빈 줄 정리
-            full_content = re.sub(r'\s+', ' ', full_content)  # 공백 정리
+            params = {
+                'serviceKey': service_key,
+                'page': page,
+                'perPage': per_page,
+                'returnType': 'json'
+            }
             
-            return full_content[:50000]  # 최대 50,000자로 제한
+            try:
+                response = await fetch_with_rate_control(
+                    self.api_rate, executor, url, max_retries=1, params=params
+                )
+            except requests.exceptions.RequestException as e:
+                last_error = e
+                attempts += 1
+                continue
             
+            if is_quota_exceeded(response):
+                print(f"⚠️ API 키 할당량 초과: {ApiKeyPool.mask(service_key)} - 다른 키로 재시도합니다.")
+                await loop.run_in_executor(None, self.key_pool.mark_exhausted, service_key)
+                continue
+            if response.status_code == 429 or response.status_code >= 500:
+                attempts += 1
+                continue
+            break
+        
+        if response is None:
+            print(f"❌ {housing_type} {page}페이지 네트워크 오류: {str(last_error)}")
+            return None
+        
+        if response.status_code == 404:
+            print(f"❌ {housing_type} API를 찾을 수 없습니다 (404) - 지원하지 않는 주택 유형일 수 있습니다.")
+            return None
+        if response.status_code != 200:
+            print(f"❌ {housing_type} {page}페이지 API 요청 실패: HTTP {response.status_code}")
+            if page == 1:  # 첫 페이지 실패시에만 상세 에러 출력
+                print(f"❌ 응답 내용: {response.text[:200]}...")
+            return None
+        
+        try:
+            payload = response.json()
+        except ValueError:
+            print(f"❌ {housing_type} {page}페이지 JSON 파싱 실패")
+            return None
+        
+        print(f"✅ {housing_type} {page}페이지: {len(payload.get('data') or [])}건 수집 완료")
+        return payload
+    
+    async def collect_housing_type(self, executor, housing_type, api_endpoint, max_pages=None):
+        """
+        한 주택 유형의 모든 페이지를 수집
+        
+        첫 페이지의 totalCount로 전체 페이지 수를 알 수 있으면 나머지 페이지를 동시에 요청하고,
+        알 수 없으면 기존처럼 한 페이지씩 순서대로 요청합니다.
+        
+        Returns:
+            list: 페이지 순서대로 정렬된 API 원본 행 리스트
+        """
+        first = await self.fetch_page(executor, housing_type, api_endpoint, 1)
+        if not first or not first.get('data'):
+            return []
+        
+        pages = {1: first['data']}
+        total_count = first.get('totalCount') or first.get('matchCount')
+        
+        if total_count:
+            last_page = math.ceil(int(total_count) / PER_PAGE)
+            if max_pages:
+                last_page = min(last_page, max_pages)
+            page_numbers = range(2, last_page + 1)
+            payloads = await asyncio.gather(*(
+                self.fetch_page(executor, housing_type, api_endpoint, page)
+                for page in page_numbers
+            ))
+            for page, payload in zip(page_numbers, payloads):
+                if payload and payload.get('data'):
+                    pages[page] = payload['data']
+        else:
+            page = 1
+            while len(pages[page]) >= PER_PAGE and not (max_pages and page >= max_pages):
+                payload = await self.fetch_page(executor, housing_type, api_endpoint, page + 1)
+                if not payload or not payload.get('data'):
+                    break
+                page += 1
+                pages[page] = payload['data']
+        
+        rows = []
+        for page in sorted(pages):
+            rows.extend(pages[page])
+        return rows
+    
+    async def collect_page_range(self, executor, housing_type, api_endpoint, page_start, page_end):
+        """
+        지정한 페이지 범위를 동시에 수집
+        
+        Returns:
+            list: 페이지 순서대로 정렬된 API 원본 행 리스트 (한 페이지라도 실패하면 None)
+        """
+        page_numbers = range(page_start, page_end + 1)
+        payloads = await asyncio.gather(*(
+            self.fetch_page(executor, housing_type, api_endpoint, page)
+            for page in page_numbers
+        ))
+        if any(payload is None for payload in payloads):
+            return None
+        
+        rows = []
+        for payload in payloads:
+            rows.extend(payload.get('data') or [])
+        return rows
+    
+    async def count_pages(self, executor, housing_type, api_endpoint, max_pages=None):
+        """
+        주택 유형별 전체 페이지 수 확인
+        
+        Returns:
+            int: 전체 페이지 수 (totalCount를 알 수 없으면 max_pages, max_pages도 없으면 0), 실패 시 None
+        """
+        payload = await self.fetch_page(executor, housing_type, api_endpoint, 1, per_page=1)
+        if payload is None:
+            return None
+        
+        total_count = payload.get('totalCount') or payload.get('matchCount')
+        if total_count is None:
+            # 전체 건수를 알 수 없으면 max_pages까지 요청 (범위를 넘는 페이지는 빈 결과)
+            return max_pages or 0
+        
+        last_page = math.ceil(int(total_count) / PER_PAGE)
+        if max_pages:
+            last_page = min(last_page, max_pages)
+        return last_page
+    
+    async def collect(self, max_pages=None):
+        """
+        모든 주택 유형의 청약 분양정보를 동시에 수집 (기한이 지나지 않은 것만)
+        
+        결과는 get_all_housing_data와 같은 형식이며, 주택 유형 및 페이지 순서를 유지합니다.
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        
+        print("🏠 모든 주택 유형의 청약정보 수집을 시작합니다... (비동기 모드)")
+        print(f"🔑 사용 API 키: {len(self.key_pool.keys)}개")
+        print("📅 기한이 지나지 않은 청약만 수집합니다")
+        print(f"⚡ 동시 요청 수: {int(self.api_rate.limit)}개에서 시작, 최대 {self.max_concurrency}개까지 자동 조절")
+        print("=" * 80)
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = await asyncio.gather(*(
+                self.collect_housing_type(executor, housing_type, api_endpoint, max_pages)
+                for housing_type, api_endpoint in HOUSING_APIS.items()
+            ))
+        
+        all_data = []
+        print("\n" + "=" * 80)
+        for housing_type, rows in zip(HOUSING_APIS, results):
+            housing_data = [parse_housing_row(housing_type, row) for row in rows]
+            housing_data = [item for item in housing_data if is_open_subscription(item, today)]
+            if housing_data:
+                all_data.extend(housing_data)
+                print(f"✅ {housing_type} 수집 완료: {len(housing_data)}건")
+            else:
+                print(f"⚠️ {housing_type}: 진행 중인 청약이 없습니다.")
+        
+        print(f"🎉 모든 주택 유형 수집 완료! 총 {len(all_data)}건의 청약정보를 수집했습니다.")
+        print(f"⚡ API 요청 {self.api_rate.total_requests}회, 혼잡 신호 {self.api_rate.total_errors}회, "
+              f"최대 동시 요청 수 {int(self.api_rate.peak_limit)}개")
+        
+        return all_data
+    
+    async def fetch_notice(self, executor, url):
+        """모집공고문 한 건을 크롤링 (실패 시 '크롤링 실패: ...' 문자열 반환)"""
+        loop = asyncio.get_running_loop()
+        try:
+            response = await fetch_with_rate_control(
+                self.notice_rate, executor, url, headers=NOTICE_HEADERS
+            )
+            response.raise_for_status()
+            response.encoding = 'utf-8'
+            return await loop.run_in_executor(
+                executor, extract_notice_text, response.text, self.notice_max_chars
+            )
         except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(2)
+            return f"크롤링 실패: {str(e)}"
+    
+    async def crawl_notices(self, items):
+        """모집공고문을 동시에 크롤링하여 각 항목의 '모집공고문_전문'에 저장"""
+        targets = []
+        for item in items:
+            notice_url = item.get('모집공고 상세 URL')
+            if notice_url and str(notice_url) != 'N/A':
+                targets.append(item)
             else:
-                return f"크롤링 실패: {str(e)}"
+                item['모집공고문_전문'] = "URL 없음"
+        
+        completed = 0
+        
+        async def crawl(item, executor):
+            nonlocal completed
+            item['모집공고문_전문'] = await self.fetch_notice(executor, item['모집공고 상세 URL'])
+            completed += 1
+            print_progress_bar(completed, len(targets), prefix='크롤링 진행', suffix='완료')
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            await asyncio.gather(*(crawl(item, executor) for item in targets))
+        
+        print(f"⚡ 공고문 요청 {self.notice_rate.total_requests}회, 혼잡 신호 {self.notice_rate.total_errors}회, "
+              f"최대 동시 요청 수 {int(self.notice_rate.peak_limit)}개")
+
+###########################
+# 분산 수집 (작업 샤딩)
+###########################
+
+class ShardQueue:
+    """
+    SQLite 기반 분산 수집 작업 큐
     
-    return "크롤링 실패: 최대 재시도 횟수 초과"
+    (주택유형, 페이지 범위) 단위의 작업을 저장하고, 로컬 워커 프로세스나
+    공유 파일시스템으로 같은 큐 파일에 접근하는 다른 호스트의 워커가 작업을 하나씩 가져가 처리합니다.
+    각 작업의 결과는 큐 파일 옆의 '<큐 이름>_results' 폴더에 JSON으로 저장됩니다.
+    """
+    
+    # 워커가 작업을 가져간 뒤 이 시간(초) 안에 끝내지 못하면 다른 워커가 다시 가져감
+    LEASE_SECONDS = 1800
+    
+    # 실패한 작업의 최대 시도 횟수
+    MAX_ATTEMPTS = 3
+    
+    # 지금 가져갈 수 있는 작업 조건 (대기 중, 재시도 가능, 임대 시간이 지난 작업)
+    CLAIMABLE = ("(status = 'pending' "
+                 "OR (status = 'failed' AND attempts < :max_attempts) "
+                 "OR (status = 'running' AND claimed_at < :lease_expired))")
+    
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.results_dir = f"{os.path.splitext(self.path)[0]}_results"
+        os.makedirs(self.results_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS shards ('
+                'id INTEGER PRIMARY KEY, type_order INTEGER NOT NULL, housing_type TEXT NOT NULL, '
+                'api_endpoint TEXT NOT NULL, page_start INTEGER NOT NULL, page_end INTEGER NOT NULL, '
+                "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+                'worker TEXT, claimed_at REAL, row_count INTEGER)'
+            )
+    
+    def _connect(self):
+        """큐 DB 연결 (트랜잭션은 직접 제어)"""
+        return sqlite3.connect(self.path, timeout=60, isolation_level=None)
+    
+    def is_planned(self):
+        """이미 작업이 등록되어 있는지 확인"""
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM shards').fetchone()[0] > 0
+    
+    def reset(self):
+        """등록된 작업과 결과 파일을 모두 삭제"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM shards')
+        for name in os.listdir(self.results_dir):
+            os.remove(os.path.join(self.results_dir, name))
+    
+    def add_shards(self, housing_type, api_endpoint, last_page, pages_per_shard):
+        """한 주택 유형의 1~last_page 페이지를 pages_per_shard 단위 작업으로 등록"""
+        type_order = list(HOUSING_APIS).index(housing_type)
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            for page_start in range(1, last_page + 1, pages_per_shard):
+                page_end = min(last_page, page_start + pages_per_shard - 1)
+                conn.execute(
+                    'INSERT INTO shards (type_order, housing_type, api_endpoint, page_start, page_end) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (type_order, housing_type, api_endpoint, page_start, page_end)
+                )
+            conn.execute('COMMIT')
+    
+    def claim(self, worker):
+        """
+        처리할 작업 하나를 가져옴 (대기 중, 재시도 가능, 임대 시간이 지난 작업 순)
+        
+        Returns:
+            dict: 작업 정보 (남은 작업이 없으면 None)
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT id, housing_type, api_endpoint, page_start, page_end FROM shards '
+                f'WHERE {self.CLAIMABLE} ORDER BY id LIMIT 1',
+                self._claimable_params(now)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE shards SET status = 'running', worker = ?, claimed_at = ?, "
+                    'attempts = attempts + 1 WHERE id = ?',
+                    (worker, now, row[0])
+                )
+            conn.execute('COMMIT')
+        
+        if not row:
+            return None
+        return dict(zip(('id', 'housing_type', 'api_endpoint', 'page_start', 'page_end'), row))
+    
+    def _claimable_params(self, now=None):
+        """CLAIMABLE 조건의 파라미터"""
+        return {'max_attempts': self.MAX_ATTEMPTS,
+                'lease_expired': (now or time.time()) - self.LEASE_SECONDS}
+    
+    def has_claimable(self):
+        """지금 바로 가져갈 수 있는 작업이 있는지 확인"""
+        with self._connect() as conn:
+            return conn.execute(
+                f'SELECT COUNT(*) FROM shards WHERE {self.CLAIMABLE}', self._claimable_params()
+            ).fetchone()[0] > 0
+    
+    def release_worker(self, worker):
+        """비정상 종료한 워커가 처리 중이던 작업을 실패 처리하여 다른 워커가 바로 가져가게 함"""
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE shards SET status = 'failed' WHERE status = 'running' AND worker = ?",
+                (worker,)
+            ).rowcount
+    
+    def result_path(self, shard_id):
+        """작업 결과 파일 경로"""
+        return os.path.join(self.results_dir, f"shard_{shard_id:05d}.json")
+    
+    def complete(self, shard_id, rows):
+        """작업 결과를 저장하고 완료 처리 (임시 파일에 쓴 뒤 교체하여 반쯤 쓰인 파일을 남기지 않음)"""
+        path = self.result_path(shard_id)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        write_bytes(temp_path, [dumps_json(rows)])
+        os.replace(temp_path, path)
+        
+        with self._connect() as conn:
+            conn.execute("UPDATE shards SET status = 'done', row_count = ? WHERE id = ?",
+                         (len(rows), shard_id))
+    
+    def fail(self, shard_id):
+        """작업 실패 처리 (MAX_ATTEMPTS까지 다른 워커가 다시 시도)"""
+        with self._connect() as conn:
+            conn.execute("UPDATE shards SET status = 'failed' WHERE id = ?", (shard_id,))
+    
+    def progress(self):
+        """상태별 작업 수 딕셔너리 반환"""
+        with self._connect() as conn:
+            return dict(conn.execute('SELECT status, COUNT(*) FROM shards GROUP BY status').fetchall())
+    
+    def is_finished(self):
+        """
+        더 이상 처리할 작업이 없는지 확인 (완료 또는 재시도 한도 초과)
+        
+        임대 시간이 지난 'running' 작업도 남은 작업으로 세므로, 기다리는 쪽에서
+        has_claimable()로 확인하여 직접 다시 처리해야 합니다.
+        """
+        with self._connect() as conn:
+            remaining = conn.execute(
+                "SELECT COUNT(*) FROM shards WHERE status IN ('pending', 'running') "
+                "OR (status = 'failed' AND attempts < ?)",
+                (self.MAX_ATTEMPTS,)
+            ).fetchone()[0]
+        return remaining == 0
+    
+    def merge(self):
+        """
+        완료된 작업 결과를 주택 유형 순서, 페이지 순서대로 합쳐 반환
+        
+        어떤 워커가 어떤 순서로 처리했든 항상 같은 결과가 나옵니다.
+        
+        Returns:
+            list: (주택유형, API 원본 행) 튜플 리스트
+        """
+        with self._connect() as conn:
+            shards = conn.execute(
+                "SELECT id, housing_type FROM shards WHERE status = 'done' "
+                'ORDER BY type_order, page_start'
+            ).fetchall()
+        
+        merged = []
+        for shard_id, housing_type in shards:
+            merged.extend((housing_type, row) for row in load_records(self.result_path(shard_id)))
+        return merged
+
+def plan_shards(config, queue, pages_per_shard):
+    """주택 유형별 전체 페이지 수를 확인하여 작업 큐에 페이지 범위 작업을 등록"""
+    collector = AsyncHousingCollector.from_config(config)
+    
+    async def count_all():
+        with ThreadPoolExecutor(max_workers=collector.max_concurrency) as executor:
+            return await asyncio.gather(*(
+                collector.count_pages(executor, housing_type, api_endpoint, config.max_pages)
+                for housing_type, api_endpoint in HOUSING_APIS.items()
+            ))
+    
+    page_counts = asyncio.run(count_all())
+    for (housing_type, api_endpoint), last_page in zip(HOUSING_APIS.items(), page_counts):
+        if not last_page:
+            print(f"⚠️ {housing_type}: 페이지 수를 확인하지 못해 작업을 등록하지 않습니다.")
+            continue
+        queue.add_shards(housing_type, api_endpoint, last_page, pages_per_shard)
+        print(f"🗂️ {housing_type}: {last_page}페이지 → {math.ceil(last_page / pages_per_shard)}개 작업 등록")
+
+def run_shard_worker(queue_path, worker_name=None):
+    """
+    작업 큐에서 작업을 하나씩 가져와 처리하는 워커 (남은 작업이 없으면 종료)
+    
+    로컬 워커 프로세스와 다른 호스트의 워커(--shard-worker)가 같은 함수를 사용합니다.
+    """
+    config = Config()
+    queue = ShardQueue(queue_path)
+    collector = AsyncHousingCollector.from_config(config)
+    worker_name = worker_name or f"{socket.gethostname()}-{os.getpid()}"
+    processed = 0
+    
+    async def process(shard):
+        with ThreadPoolExecutor(max_workers=collector.max_concurrency) as executor:
+            return await collector.collect_page_range(
+                executor, shard['housing_type'], shard['api_endpoint'],
+                shard['page_start'], shard['page_end']
+            )
+    
+    while True:
+        shard = queue.claim(worker_name)
+        if shard is None:
+            break
+        
+        print(f"🔧 [{worker_name}] 작업 {shard['id']}: {shard['housing_type']} "
+              f"{shard['page_start']}~{shard['page_end']}페이지")
+        try:
+            rows = asyncio.run(process(shard))
+        except BaseException:
+            # 예외나 Ctrl+C로 종료되더라도 임대 시간을 기다리지 않고 다시 시도할 수 있게 실패 처리
+            queue.fail(shard['id'])
+            print(f"❌ [{worker_name}] 작업 {shard['id']} 처리 중 중단되었습니다.")
+            raise
+        
+        if rows is None:
+            queue.fail(shard['id'])
+            print(f"❌ [{worker_name}] 작업 {shard['id']} 실패 - 나중에 다시 시도합니다.")
+        else:
+            queue.complete(shard['id'], rows)
+            processed += 1
+    
+    print(f"✅ [{worker_name}] 워커 종료: {processed}개 작업 처리")
+    return processed
+
+def collect_sharded(config, queue_path, workers=1, pages_per_shard=5, poll_interval=5):
+    """
+    작업 샤딩 모드로 청약정보를 수집
+    
+    큐가 비어 있으면 작업을 등록하고, 로컬 워커 프로세스를 실행한 뒤
+    (다른 호스트의 워커를 포함하여) 모든 작업이 끝나면 결과를 병합합니다.
+    남은 작업이 있는 큐만 이어서 사용하며, 이미 끝난 큐는 비우고 새로 수집합니다.
+    
+    Returns:
+        list: get_all_housing_data와 같은 형식의 청약정보 리스트 (기한이 지나지 않은 것만)
+    """
+    queue = ShardQueue(queue_path)
+    if queue.is_planned() and not queue.is_finished():
+        print(f"📂 기존 작업 큐를 이어서 사용합니다: {queue.path} {queue.progress()}")
+    else:
+        if queue.is_planned():
+            print(f"🧹 이전 수집이 끝난 작업 큐를 비웁니다: {queue.path}")
+            queue.reset()
+        print(f"🗂️ 작업 큐 생성: {queue.path}")
+        plan_shards(config, queue, pages_per_shard)
+    
+    print(f"🚀 로컬 워커 {workers}개를 실행합니다...")
+    worker_names = [f"{socket.gethostname()}-local{i + 1}-{os.getpid()}" for i in range(workers)]
+    processes = [
+        multiprocessing.Process(target=run_shard_worker, args=(queue.path, worker_name))
+        for worker_name in worker_names
+    ]
+    for process in processes:
+        process.start()
+    for worker_name, process in zip(worker_names, processes):
+        process.join()
+        if process.exitcode != 0:
+            released = queue.release_worker(worker_name)
+            print(f"⚠️ 워커 {worker_name}가 비정상 종료되었습니다 (종료 코드 {process.exitcode}, "
+                  f"처리 중이던 작업 {released}개는 다시 처리합니다).")
+    
+    # 다른 호스트의 워커가 처리 중인 작업이 끝날 때까지 대기하면서,
+    # 실패했거나 임대 시간이 지난 작업(중단된 워커의 작업)은 직접 처리
+    while not queue.is_finished():
+        if queue.has_claimable():
+            print("♻️ 남은 작업을 직접 처리합니다...")
+            run_shard_worker(queue.path, f"{socket.gethostname()}-coordinator-{os.getpid()}")
+            continue
+        print(f"⏳ 다른 워커의 작업 완료 대기 중... {queue.progress()}")
+        time.sleep(poll_interval)
+    
+    progress = queue.progress()
+    if progress.get('failed'):
+        print(f"⚠️ 재시도 한도를 넘어 실패한 작업 {progress['failed']}개는 결과에서 제외됩니다.")
+    
+    today = datetime.now().strftime('%Y-%m-%d')
+    all_data = []
+    for housing_type, row in queue.merge():
+        housing_info = parse_housing_row(housing_type, row)
+        if is_open_subscription(housing_info, today):
+            all_data.append(housing_info)
+    
+    print(f"🎉 분산 수집 완료! 총 {len(all_data)}건의 청약정보를 병합했습니다.")
+    return all_data
+
+###########################
+# 과거 이력 전체 수집 (백필)
+###########################
+
+class BackfillWriter:
+    """
+    백필 결과를 JSONL 파일로 스트리밍 저장하고 페이지 단위로 진행 상황을 기록
+    
+    체크포인트 파일에는 페이지를 저장할 때마다 (주택유형, 페이지, 건수, 저장 후 파일 크기)를
+    한 줄씩 추가합니다. 다시 실행하면 완료된 페이지는 건너뛰고, 데이터 파일과 체크포인트 파일에서
+    마지막 체크포인트 이후에 쓰다 만 부분은 잘라낸 뒤 이어서 저장합니다.
+    """
+    
+    def __init__(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        self.data_path = os.path.join(folder, '청약정보_전체이력.jsonl')
+        self.checkpoint_path = os.path.join(folder, 'checkpoint.tsv')
+        self.completed = set()
+        self.row_count = 0
+        
+        offset = 0
+        checkpoint_offset = 0
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'rb') as f:
+                for line in f:
+                    # 기록 도중 중단되어 줄바꿈 없이 끝난 줄은 무시 (아래에서 잘라냄)
+                    if not line.endswith(b'\n'):
+                        break
+                    housing_type, page, rows, offset = line.decode('utf-8').rstrip('\n').split('\t')
+                    self.completed.add((housing_type, int(page)))
+                    self.row_count += int(rows)
+                    offset = int(offset)
+                    checkpoint_offset += len(line)
+        
+        self._data = open(self.data_path, 'ab')
+        self._data.truncate(offset)
+        self._checkpoint = open(self.checkpoint_path, 'ab')
+        self._checkpoint.truncate(checkpoint_offset)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def write_page(self, housing_type, page, items):
+        """한 페이지의 청약정보를 저장한 뒤 체크포인트 기록"""
+        self._data.write(b''.join(dumps_json(item) + b'\n' for item in items))
+        self._data.flush()
+        
+        self._checkpoint.write(f"{housing_type}\t{page}\t{len(items)}\t{self._data.tell()}\n".encode('utf-8'))
+        self._checkpoint.flush()
+        
+        self.completed.add((housing_type, page))
+        self.row_count += len(items)
+    
+    def close(self):
+        """파일 닫기"""
+        self._data.close()
+        self._checkpoint.close()
+
+def subscription_status(item, today):
+    """백필 행의 청약상태 ('진행중' 또는 '마감')"""
+    return '진행중' if is_open_subscription(item, today) else '마감'
+
+async def backfill_housing_data(collector, writer):
+    """
+    모든 주택 유형의 전체 과거 이력을 페이지 단위로 동시에 수집하여 writer에 저장
+    
+    max_pages 제한과 기한 필터 없이 모든 행을 '청약상태'와 함께 저장합니다.
+    동시에 처리 중인 페이지만 메모리에 남으므로 이력이 길어도 메모리 사용량이 일정합니다.
+    전체 건수를 알 수 없는 주택 유형은 100건보다 적은 페이지가 나올 때까지 한 페이지씩 차례로 수집합니다.
+    
+    Returns:
+        list: 실패한 (주택유형, 페이지) 목록 (다시 실행하면 이 페이지들만 수집)
+    """
+    today = datetime.now().strftime('%Y-%m-%d')
+    pending = deque()
+    open_ended = []
+    failed = []
+    
+    with ThreadPoolExecutor(max_workers=collector.max_concurrency) as executor:
+        page_counts = await asyncio.gather(*(
+            collector.count_pages(executor, housing_type, api_endpoint)
+            for housing_type, api_endpoint in HOUSING_APIS.items()
+        ))
+        
+        for (housing_type, api_endpoint), last_page in zip(HOUSING_APIS.items(), page_counts):
+            if last_page is None:
+                print(f"⚠️ {housing_type}: 페이지 수를 확인하지 못해 건너뜁니다.")
+                continue
+            if last_page == 0:
+                print(f"📚 {housing_type}: 전체 건수를 알 수 없어 마지막 페이지까지 차례로 수집합니다")
+                open_ended.append((housing_type, api_endpoint))
+                continue
+            remaining = [page for page in range(1, last_page + 1)
+                         if (housing_type, page) not in writer.completed]
+            print(f"📚 {housing_type}: 전체 {last_page}페이지 중 {len(remaining)}페이지 수집 예정")
+            pending.extend((housing_type, api_endpoint, page) for page in remaining)
+        
+        total_pages = len(pending)
+        completed = 0
+        
+        async def backfill_page(housing_type, api_endpoint, page):
+            """한 페이지를 수집하여 저장하고 API 원본 행 수 반환 (실패 시 None, 빈 페이지는 저장하지 않음)"""
+            nonlocal completed
+            payload = await collector.fetch_page(executor, housing_type, api_endpoint, page)
+            if payload is None:
+                failed.append((housing_type, page))
+                return None
+            
+            rows = payload.get('data') or []
+            if rows:
+                items = []
+                for row in rows:
+                    housing_info = parse_housing_row(housing_type, row)
+                    housing_info['청약상태'] = subscription_status(housing_info, today)
+                    items.append(housing_info)
+                writer.write_page(housing_type, page, items)
+            
+            completed += 1
+            print_progress_bar(completed, total_pages, prefix='백필 진행', suffix='완료')
+            return len(rows)
+        
+        async def worker():
+            while pending:
+                await backfill_page(*pending.popleft())
+        
+        async def scan(housing_type, api_endpoint):
+            """전체 페이지 수를 모르는 주택 유형을 짧은 페이지가 나올 때까지 순서대로 수집"""
+            nonlocal total_pages
+            page = 0
+            while True:
+                page += 1
+                if (housing_type, page) in writer.completed:
+                    continue
+                total_pages += 1
+                row_count = await backfill_page(housing_type, api_endpoint, page)
+                if row_count is None or row_count < PER_PAGE:
+                    break
+        
+        # 동시 요청 수는 속도 제어기가 조절하므로 워커는 최대 동시 요청 수만큼만 둠
+        await asyncio.gather(
+            *(worker() for _ in range(collector.max_concurrency)),
+            *(scan(housing_type, api_endpoint) for housing_type, api_endpoint in open_ended)
+        )
+    
+    return failed
+
+def run_backfill(config, output_folder):
+    """전체 과거 이력을 백필 폴더에 수집 (중단되었으면 이어서 수집)"""
+    backfill_folder = os.path.join(output_folder, 'backfill')
+    collector = AsyncHousingCollector.from_config(config)
+    
+    with BackfillWriter(backfill_folder) as writer:
+        if writer.completed:
+            print(f"📂 이전 백필을 이어서 진행합니다: {len(writer.completed)}페이지, {writer.row_count}건 완료")
+        
+        failed = asyncio.run(backfill_housing_data(collector, writer))
+    
+    print("\n" + "=" * 60)
+    print(f"🎉 백필 완료: 총 {writer.row_count}건 저장")
+    print(f"📁 저장 위치: {writer.data_path}")
+    if failed:
+        print(f"⚠️ {len(failed)}개 페이지 수집 실패 - 다시 실행하면 실패한 페이지만 이어서 수집합니다.")
+    return failed
+
+###########################
+# JSON 직렬화 및 압축
+###########################
+
+# 파일 이름 끝부분별 압축 방식
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.zst': 'zstd'}
+
+def dumps_json(obj, pretty=False, sort_keys=False):
+    """
+    객체를 UTF-8 JSON 바이트로 직렬화
+    
+    orjson이 설치되어 있으면 사용하고, 없으면 표준 json 모듈로 같은 형식의 결과를 만듭니다.
+    compact 모드는 공백 없이, pretty 모드는 2칸 들여쓰기로 출력합니다.
+    """
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if pretty else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option)
+    
+    return json.dumps(
+        obj, ensure_ascii=False, sort_keys=sort_keys,
+        indent=2 if pretty else None,
+        separators=(',', ': ') if pretty else (',', ':')
+    ).encode('utf-8')
+
+def loads_json(data):
+    """JSON 바이트(또는 문자열)를 객체로 변환 (orjson이 있으면 사용)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _compression_of(path):
+    """파일 이름으로 압축 방식 판단 ('gzip', 'zstd' 또는 None)"""
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(path)[1])
+
+def _is_jsonl(path):
+    """파일 이름으로 JSON Lines 형식인지 판단 (압축 확장자 제외)"""
+    if _compression_of(path):
+        path = os.path.splitext(path)[0]
+    return path.endswith('.jsonl')
+
+def write_bytes(path, chunks):
+    """바이트 조각들을 파일 이름에 맞는 압축 방식(.gz/.zst/무압축)으로 저장"""
+    compression = _compression_of(path)
+    if compression == 'gzip':
+        f = gzip.open(path, 'wb', compresslevel=6)
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstd 압축에는 zstandard 패키지가 필요합니다: pip install zstandard")
+        f = zstandard.ZstdCompressor(level=3).stream_writer(open(path, 'wb'))
+    else:
+        f = open(path, 'wb')
+    
+    with f:
+        for chunk in chunks:
+            f.write(chunk)
+
+def read_bytes(path):
+    """파일 이름에 맞는 방식으로 압축을 풀어 전체 내용을 바이트로 읽음"""
+    compression = _compression_of(path)
+    if compression == 'gzip':
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstd 압축 파일을 읽으려면 zstandard 패키지가 필요합니다: pip install zstandard")
+        with open(path, 'rb') as f:
+            return b''.join(zstandard.ZstdDecompressor().read_to_iter(f))
+    with open(path, 'rb') as f:
+        return f.read()
+
+def dump_records(records, path, pretty=False):
+    """
+    청약정보 리스트를 파일로 저장
+    
+    파일 이름으로 형식과 압축을 정합니다: .json(하나의 배열), .jsonl(한 줄에 한 건),
+    그리고 각각에 .gz 또는 .zst를 붙이면 압축합니다. JSONL은 항상 compact 형식입니다.
+    """
+    if _is_jsonl(path):
+        write_bytes(path, (dumps_json(record) + b'\n' for record in records))
+    else:
+        write_bytes(path, [dumps_json(records, pretty=pretty)])
+
+def load_records(path):
+    """dump_records로 저장한 파일(.json/.jsonl, 압축 포함)에서 청약정보 리스트를 읽음"""
+    data = read_bytes(path)
+    if _is_jsonl(path):
+        return [loads_json(line) for line in data.splitlines() if line.strip()]
+    return loads_json(data)
+
+def json_snapshot_suffix(config):
+    """설정에 따른 JSON 결과 파일 확장자 ('.json', '.json.gz', '.json.zst')"""
+    compression = config.json_compression.lower()
+    if compression == 'zstd' and zstandard is None:
+        print("⚠️ zstandard 패키지가 없어 gzip으로 압축합니다. (pip install zstandard)")
+        compression = 'gzip'
+    return {'gzip': '.json.gz', 'zstd': '.json.zst'}.get(compression, '.json')
+
+###########################
+# 청약 일정 인덱스 및 캘린더 내보내기
+###########################
+
+# 일정 필드와 캘린더에 표시할 이름
+SCHEDULE_FIELDS = {
+    '모집공고일': '모집공고',
+    '접수시작일': '접수 시작',
+    '접수종료일': '접수 마감',
+    '청약접수 시작일': '청약접수 시작',
+    '청약접수 종료일': '청약접수 마감',
+    '일반공급 접수 시작일': '일반공급 접수 시작',
+    '일반공급 접수 종료일': '일반공급 접수 마감',
+    '당첨자 발표일': '당첨자 발표',
+    '계약시작일': '계약 시작',
+    '계약종료일': '계약 마감',
+}
+
+# 캘린더 파일을 나누어 만들 기준 필드
+CALENDAR_GROUP_FIELDS = ('주택유형', '공급지역')
+
+def reception_status(item, today):
+    """
+    접수 상태 판단
+    
+    Returns:
+        str: '접수예정'(접수시작일이 오늘 이후), '접수중'(접수종료일 전), '접수완료', 일정이 없으면 None
+    """
+    start = normalize_date(item.get('접수시작일'))
+    end = normalize_date(item.get('접수종료일'))
+    if start and start >= today:
+        return '접수예정'
+    if end and end >= today:
+        return '접수중'
+    if start or end:
+        return '접수완료'
+    return None
+
+class ScheduleIndex:
+    """
+    청약 일정 이벤트 인덱스
+    
+    모든 일정 필드를 (날짜, 행 번호, 필드) 이벤트로 펼쳐 날짜순 배열로 한 번만 정렬해 두고,
+    "앞으로 N일 안의 일정" 조회를 이분 탐색으로 처리합니다. 주택유형·공급지역별 배열과
+    행별 접수 상태도 미리 계산하여 엑셀·마크다운·캘린더 생성에서 함께 사용합니다.
+    """
+    
+    def __init__(self, records, today=None):
+        self.records = records
+        self.today = today or datetime.now().strftime('%Y-%m-%d')
+        self.statuses = [reception_status(item, self.today) for item in records]
+        
+        # 같은 공고의 주택형(모델)별 행은 일정이 같으므로 공고당 한 번만 등록
+        events = []
+        seen = set()
+        for i, item in enumerate(records):
+            notice_key = (item.get('주택관리번호'), item.get('공고번호')) if item.get('주택관리번호') else i
+            for field in SCHEDULE_FIELDS:
+                date = normalize_date(item.get(field))
+                if date and (notice_key, field) not in seen:
+                    seen.add((notice_key, field))
+                    events.append((date, i, field))
+        events.sort()
+        self.events = events
+        self.dates = [date for date, _, _ in events]
+        
+        # 그룹별 정렬 배열 (전체 배열이 이미 정렬되어 있으므로 순서대로 나누기만 하면 됨)
+        self.groups = {}
+        for event in events:
+            item = records[event[1]]
+            for field in CALENDAR_GROUP_FIELDS:
+                value = item.get(field)
+                if value:
+                    self.groups.setdefault((field, value), []).append(event)
+        self.group_dates = {key: [event[0] for event in group] for key, group in self.groups.items()}
+    
+    def between(self, start, end, housing_type=None, region=None):
+        """start~end(양 끝 포함) 사이의 일정 이벤트를 날짜순으로 반환"""
+        if housing_type:
+            events = self.groups.get(('주택유형', housing_type), [])
+            dates = self.group_dates.get(('주택유형', housing_type), [])
+        elif region:
+            events = self.groups.get(('공급지역', region), [])
+            dates = self.group_dates.get(('공급지역', region), [])
+        else:
+            events, dates = self.events, self.dates
+        
+        selected = events[bisect.bisect_left(dates, start):bisect.bisect_right(dates, end)]
+        if housing_type and region:
+            selected = [event for event in selected if self.records[event[1]].get('공급지역') == region]
+        return selected
+    
+    def upcoming(self, days=7, housing_type=None, region=None, start=None):
+        """start(기본: 오늘)부터 days일 안(시작일 포함)의 일정 이벤트 반환"""
+        start = start or self.today
+        end = (datetime.strptime(start, '%Y-%m-%d') + timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        return self.between(start, end, housing_type, region)
+
+def _ics_escape(text):
+    """iCalendar TEXT 값 이스케이프"""
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+def _ics_fold(line):
+    """iCalendar 규칙에 따라 한 줄을 75바이트 이하로 접기 (UTF-8 글자 중간에서 자르지 않음)"""
+    folded = []
+    current = ''
+    current_bytes = 0
+    for char in line:
+        size = len(char.encode('utf-8'))
+        if current_bytes + size > 75:
+            folded.append(current)
+            current = ' '
+            current_bytes = 1
+        current += char
+        current_bytes += size
+    folded.append(current)
+    return '\r\n'.join(folded)
+
+# 생성 시각(DTSTAMP)만 다른 캘린더는 내용이 같은 것으로 봄
+ICS_DTSTAMP_PATTERN = re.compile(rb'^DTSTAMP:[^\r\n]*\r\n', re.MULTILINE)
+
+def build_ics_event(index, event, dtstamp):
+    """일정 이벤트 하나를 VEVENT 줄 목록으로 변환 (dtstamp: 캘린더 생성 시각, UTC 'YYYYMMDDTHHMMSSZ')"""
+    date, row, field = event
+    item = index.records[row]
+    day = date.replace('-', '')
+    next_day = (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y%m%d')
+    notice_id = f"{item.get('주택관리번호')}-{item.get('공고번호')}" if item.get('주택관리번호') else f"row{row}"
+    
+    description = [f"{label}: {item.get(key)}" for key, label in (
+        ('주택유형', '주택유형'), ('공급지역', '공급지역'), ('총 공급세대수', '총 공급세대'),
+        ('문의처 전화번호', '문의전화'), ('모집공고 상세 URL', '모집공고')
+    ) if item.get(key)]
+    
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:{notice_id}-{hashlib.sha1(field.encode('utf-8')).hexdigest()[:8]}@apartment-subscription",
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART;VALUE=DATE:{day}",
+        f"DTEND;VALUE=DATE:{next_day}",
+        f"SUMMARY:{_ics_escape(f'[{SCHEDULE_FIELDS[field]}] ' + str(item.get('주택명') or '이름없음'))}",
+        f"DESCRIPTION:{_ics_escape(chr(10).join(description))}",
+    ]
+    if item.get('공급위치 주소'):
+        lines.append(f"LOCATION:{_ics_escape(item['공급위치 주소'])}")
+    if item.get('모집공고 상세 URL'):
+        lines.append(f"URL:{item['모집공고 상세 URL']}")
+    lines.append('END:VEVENT')
+    return lines
+
+def render_ics(index, events, calendar_name, dtstamp):
+    """일정 이벤트 목록을 iCalendar(.ics) 바이트로 변환"""
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//apartment-subscription//청약일정//KO',
+        'CALSCALE:GREGORIAN',
+        f"X-WR-CALNAME:{_ics_escape(calendar_name)}",
+    ]
+    for event in events:
+        lines.extend(build_ics_event(index, event, dtstamp))
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(_ics_fold(line) for line in lines) + '\r\n').encode('utf-8')
+
+def export_ics(index, calendar_folder):
+    """
+    전체 및 주택유형·공급지역별 청약 일정 캘린더(.ics) 파일 생성
+    
+    내용이 바뀐 파일만 이번 실행의 생성 시각(DTSTAMP)으로 다시 쓰므로 수집 후 매번 실행해도
+    바뀐 캘린더만 갱신됩니다. UID는 공고와 일정 항목으로 정해지고 바뀐 일정은 더 최근의 DTSTAMP를
+    가지므로, 캘린더 앱에서 중복 없이 새 일정으로 갱신됩니다.
+    더 이상 데이터에 없는 주택유형·공급지역의 캘린더 파일은 삭제합니다.
+    
+    Returns:
+        tuple: (갱신된 파일 수, 전체 파일 수)
+    """
+    print(f"\n📅 청약 일정 캘린더 생성 중: {calendar_folder}")
+    os.makedirs(calendar_folder, exist_ok=True)
+    calendars = {'청약일정_전체': ('전체 청약일정', index.events)}
+    for (field, value), events in index.groups.items():
+        calendars[sanitize_filename(f"청약일정_{field}_{value}")] = (f"{value} 청약일정", events)
+    
+    dtstamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    updated = 0
+    for name, (calendar_name, events) in calendars.items():
+        path = os.path.join(calendar_folder, f"{name}.ics")
+        content = render_ics(index, events, calendar_name, dtstamp)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                if ICS_DTSTAMP_PATTERN.sub(b'', f.read()) == ICS_DTSTAMP_PATTERN.sub(b'', content):
+                    continue
+        with open(path, 'wb') as f:
+            f.write(content)
+        updated += 1
+    
+    # 이번 실행에서 만들지 않은 캘린더는 구독자에게 지난 일정이 남지 않도록 삭제
+    removed = 0
+    for filename in os.listdir(calendar_folder):
+        if (filename.startswith('청약일정_') and filename.endswith('.ics')
+                and filename[:-len('.ics')] not in calendars):
+            os.remove(os.path.join(calendar_folder, filename))
+            removed += 1
+    
+    print(f"💾 캘린더 파일 저장 완료: {len(calendars)}개 중 {updated}개 갱신"
+          f"{f', 지난 캘린더 {removed}개 삭제' if removed else ''}")
+    return updated, len(calendars)
 
 ###########################
 # 파일 저장 함수들
 ###########################
 
-def save_to_excel(data, filename):
+def save_to_excel(data, filename, schedule_index=None):
     """엑셀 파일로 저장"""
     print(f"\n📊 엑셀 파일 생성 중: {filename}")
     
     df = pd.DataFrame(data)
     
     # 향후 청약 가능한 분양정보 필터링 (접수시작일이 오늘 이후)
-    today = datetime.now().strftime("%Y-%m-%d")
-    future_subscriptions = df[df['접수시작일'] >= today] if '접수시작일' in df.columns else pd.DataFrame()
+    schedule_index = schedule_index or ScheduleIndex(data)
+    future_subscriptions = df[[status == '접수예정' for status in schedule_index.statuses]] if data else df
     
     with pd.ExcelWriter(filename, engine='openpyxl') as writer:
         # 전체 데이터
@@ -406,19 +1897,20 @@ def save_to_excel(data, filename):
     
     print(f"💾 엑셀 파일 저장 완료: {filename}")
 
-def save_to_json(data, filename):
-    """JSON 파일로 저장"""
+def save_to_json(data, filename, pretty=True):
+    """JSON 파일로 저장 (파일 이름이 .gz/.zst로 끝나면 압축)"""
     print(f"\n🔧 JSON 파일 생성 중: {filename}")
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    dump_records(data, filename, pretty=pretty)
     
     print(f"💾 JSON 파일 저장 완료: {filename}")
 
-def create_detailed_markdown(data, filename):
+def create_detailed_markdown(data, filename, schedule_index=None):
     """상세한 마크다운 파일 생성 (공고문 포함)"""
     print(f"\n📝 마크다운 파일 생성 중: {filename}")
     
+    schedule_index = schedule_index or ScheduleIndex(data)
+    
     with open(filename, 'w', encoding='utf-8') as f:
         f.write(f"# 🏠 전체 주택유형 청약정보 ({len(data)}건)\n\n")
         
@@ -450,12 +1942,10 @@ def create_detailed_markdown(data, filename):
             f.write(f"![유형](https://img.shields.io/badge/유형-{house_type}-orange)\n\n")
             
             # 상태 배지
-            today = datetime.now().strftime("%Y-%m-%d")
-            reception_start = str(item.get('접수시작일', ''))
-            if reception_start and reception_start >= today:
-                f.write("![상태](https://img.shields.io/badge/상태-접수예정-blue)\n\n")
-            elif reception_start and reception_start != 'N/A':
-                f.write("![상태](https://img.shields.io/badge/상태-접수완료-gray)\n\n")
+            status = schedule_index.statuses[i - 1]
+            if status:
+                color = {'접수예정': 'blue', '접수중': 'green', '접수완료': 'gray'}[status]
+                f.write(f"![상태](https://img.shields.io/badge/상태-{status}-{color})\n\n")
             
             # 기본 정보
             f.write("### 📋 기본 정보\n\n")
@@ -509,12 +1999,367 @@ def create_detailed_markdown(data, filename):
     
     print(f"💾 마크다운 파일 저장 완료: {filename}")
 
+###########################
+# 성능 프로파일링
+###########################
+
+class StageProfiler:
+    """
+    main()의 각 단계를 cProfile(선택적으로 tracemalloc)로 측정하는 프로파일러
+    
+    단계마다 <단계>.prof(snakeviz, flameprof 등으로 플레임그래프 생성 가능),
+    <단계>_top.txt(시간 상위 함수), <단계>_memory.txt(메모리 할당 상위 위치)를
+    결과 폴더의 profile_YYYYMMDD_HHMMSS 폴더에 저장합니다.
+    비활성화 상태에서는 아무것도 측정하지 않습니다.
+    """
+    
+    def __init__(self, output_folder, enabled=False, trace_memory=False, top_n=30):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.top_n = top_n
+        self.timings = []
+        self.folder = None
+        if enabled:
+            self.folder = os.path.join(output_folder, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            os.makedirs(self.folder, exist_ok=True)
+    
+    @contextlib.contextmanager
+    def stage(self, name):
+        """with 블록 하나를 한 단계로 측정"""
+        if not self.enabled:
+            yield
+            return
+        
+        # Python 3.12 미만의 cProfile은 호출한 스레드만 측정하므로,
+        # 단계 중 새로 시작된 스레드(비동기 수집의 요청 스레드 등)에도 프로파일러를 붙임
+        thread_profiles = []
+        
+        def profile_new_thread(frame, event, arg):
+            sys.setprofile(None)
+            thread_profile = cProfile.Profile()
+            thread_profiles.append(thread_profile)
+            thread_profile.enable()
+        
+        if self.trace_memory:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+        
+        profile = cProfile.Profile()
+        if sys.version_info < (3, 12):
+            threading.setprofile(profile_new_thread)
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            threading.setprofile(None)
+            self.timings.append((name, elapsed))
+            
+            # 보고서 작성에 쓰인 메모리가 섞이지 않도록 CPU 보고서보다 먼저 측정을 끝냄
+            if self.trace_memory:
+                after = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            
+            self._write_cpu_report(name, profile, thread_profiles)
+            if self.trace_memory:
+                self._write_memory_report(name, before, after, peak)
+    
+    def _write_cpu_report(self, name, profile, thread_profiles):
+        """.prof 파일과 상위 함수 요약 저장"""
+        stats = pstats.Stats(profile)
+        for thread_profile in thread_profiles:
+            stats.add(thread_profile)
+        stats.dump_stats(os.path.join(self.folder, f"{name}.prof"))
+        
+        with open(os.path.join(self.folder, f"{name}_top.txt"), 'w', encoding='utf-8') as f:
+            stats.stream = f
+            f.write(f"# {name}: 누적 시간 상위 {self.top_n}개 함수\n")
+            stats.sort_stats('cumulative').print_stats(self.top_n)
+            f.write(f"\n# {name}: 자체 시간 상위 {self.top_n}개 함수\n")
+            stats.sort_stats('tottime').print_stats(self.top_n)
+    
+    def _write_memory_report(self, name, before, after, peak):
+        """단계 동안 늘어난 메모리 할당 상위 위치 저장"""
+        ignore = tuple(tracemalloc.Filter(False, module.__file__) for module in (tracemalloc, cProfile, pstats))
+        stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+        
+        with open(os.path.join(self.folder, f"{name}_memory.txt"), 'w', encoding='utf-8') as f:
+            f.write(f"# {name}: 최대 메모리 사용량 {peak / 1024 / 1024:.1f} MB\n")
+            f.write(f"# 단계 동안 늘어난 메모리 상위 {self.top_n}개 위치\n")
+            for stat in stats[:self.top_n]:
+                f.write(f"{stat}\n")
+    
+    def write_summary(self):
+        """단계별 소요 시간을 출력하고 summary.txt로 저장"""
+        if not self.enabled or not self.timings:
+            return
+        
+        with open(os.path.join(self.folder, 'summary.txt'), 'w', encoding='utf-8') as f:
+            for name, elapsed in self.timings:
+                f.write(f"{name}\t{elapsed:.3f}s\n")
+        
+        print("\n⏱️ 단계별 소요 시간:")
+        for name, elapsed in self.timings:
+            print(f"   {name}: {elapsed:.2f}초")
+        print(f"📁 프로파일 결과: {self.folder}")
+
+###########################
+# 조회용 HTTP 서버
+###########################
+
+# 날짜 범위 조회에 사용할 수 있는 일정 필드
+QUERY_DATE_FIELDS = ('모집공고일', '접수시작일', '접수종료일', '당첨자 발표일')
+
+def find_latest_snapshot(output_folder):
+    """결과 폴더에서 가장 최근 날짜의 청약정보 JSON 파일(압축 포함) 경로 반환 (없으면 None)"""
+    if not os.path.isdir(output_folder):
+        return None
+    snapshots = sorted(
+        name for name in os.listdir(output_folder)
+        if re.fullmatch(r'청약정보_\d{8}\.json(\.gz|\.zst)?', name)
+    )
+    return os.path.join(output_folder, snapshots[-1]) if snapshots else None
+
+class SubscriptionIndex:
+    """
+    청약정보 조회용 메모리 인덱스
+    
+    주택유형·공급지역별 행 번호 목록과 일정 필드별 정렬 배열을 미리 만들어 두고,
+    같은 조회는 LRU 캐시에 저장된 응답을 그대로 돌려줍니다.
+    """
+    
+    def __init__(self, records, source, cache_size=256):
+        self.records = records
+        self.source = source
+        self.by_type = defaultdict(list)
+        self.by_region = defaultdict(list)
+        for i, item in enumerate(records):
+            self.by_type[item.get('주택유형')].append(i)
+            self.by_region[item.get('공급지역')].append(i)
+        
+        # 날짜 필드별 (날짜, 행 번호) 정렬 배열 - 기간 조회는 이분 탐색 (날짜 형식은 normalize_date로 통일)
+        self.date_keys = {}
+        self.date_rows = {}
+        for field in QUERY_DATE_FIELDS:
+            dates = ((normalize_date(item.get(field)), i) for i, item in enumerate(records))
+            pairs = sorted((date, i) for date, i in dates if date)
+            self.date_keys[field] = [date for date, _ in pairs]
+            self.date_rows[field] = [i for _, i in pairs]
+        
+        self.schedule = ScheduleIndex(records)
+        
+        stat = os.stat(source)
+        self.version = hashlib.sha1(f"{source}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8')).hexdigest()[:12]
+        self.render = functools.lru_cache(maxsize=cache_size)(self._render)
+    
+    def query(self, housing_type=None, region=None, date_from=None, date_to=None, date_field='접수시작일'):
+        """조건에 맞는 행 번호를 원래 순서대로 반환"""
+        candidates = []
+        if housing_type:
+            candidates.append(self.by_type.get(housing_type, []))
+        if region:
+            candidates.append(self.by_region.get(region, []))
+        if date_from or date_to:
+            keys = self.date_keys[date_field]
+            start = bisect.bisect_left(keys, date_from) if date_from else 0
+            end = bisect.bisect_right(keys, date_to) if date_to else len(keys)
+            candidates.append(self.date_rows[date_field][start:end])
+        
+        if not candidates:
+            return range(len(self.records))
+        
+        # 가장 작은 후보 목록을 기준으로 나머지 조건과 교집합
+        candidates.sort(key=len)
+        matched = set(candidates[0])
+        for rows in candidates[1:]:
+            matched.intersection_update(rows)
+        return sorted(matched)
+    
+    def _render(self, housing_type, region, date_from, date_to, date_field, page, per_page):
+        """조회 결과를 JSON 응답 본문과 ETag로 변환 (LRU 캐시 대상)"""
+        rows = self.query(housing_type, region, date_from, date_to, date_field)
+        start = (page - 1) * per_page
+        body = dumps_json({
+            'total': len(rows),
+            'page': page,
+            'per_page': per_page,
+            'items': [self.records[i] for i in rows[start:start + per_page]]
+        })
+        etag = f'"{self.version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+        return body, etag
+
+class SubscriptionRequestHandler(BaseHTTPRequestHandler):
+    """
+    청약정보 조회 API 요청 처리기
+    
+    GET /api/subscriptions?주택유형=&공급지역=&from=&to=&date_field=&page=&per_page=
+    GET /api/upcoming?days=&주택유형=&공급지역=
+    GET /api/health
+    """
+    
+    index = None
+    max_per_page = 500
+    
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == '/api/subscriptions':
+            self._handle_query(urllib.parse.parse_qs(url.query))
+        elif url.path == '/api/upcoming':
+            self._handle_upcoming(urllib.parse.parse_qs(url.query))
+        elif url.path == '/api/health':
+            cache = self.index.render.cache_info()
+            self._send_json(200, {
+                'status': 'ok',
+                'source': os.path.basename(self.index.source),
+                'records': len(self.index.records),
+                'cache': {'hits': cache.hits, 'misses': cache.misses, 'size': cache.currsize}
+            })
+        else:
+            self._send_json(404, {'error': f"알 수 없는 경로입니다: {url.path}"})
+    
+    def _handle_query(self, params):
+        """조회 파라미터를 검증하고 캐시된 결과 응답"""
+        def param(name, default=None):
+            return params.get(name, [default])[0] or default
+        
+        try:
+            page = int(param('page', 1))
+            per_page = int(param('per_page', 50))
+        except ValueError:
+            self._send_json(400, {'error': "page와 per_page는 정수여야 합니다."})
+            return
+        if page < 1 or not 1 <= per_page <= self.max_per_page:
+            self._send_json(400, {'error': f"page는 1 이상, per_page는 1~{self.max_per_page} 사이여야 합니다."})
+            return
+        
+        date_field = param('date_field', '접수시작일')
+        if date_field not in QUERY_DATE_FIELDS:
+            self._send_json(400, {'error': f"date_field는 {', '.join(QUERY_DATE_FIELDS)} 중 하나여야 합니다."})
+            return
+        
+        date_range = [param(name) for name in ('from', 'to')]
+        if any(value and not normalize_date(value) for value in date_range):
+            self._send_json(400, {'error': "from과 to는 YYYY-MM-DD 또는 YYYYMMDD 형식이어야 합니다."})
+            return
+        date_from, date_to = (normalize_date(value) for value in date_range)
+        
+        body, etag = self.index.render(
+            param('주택유형'), param('공급지역'), date_from, date_to,
+            date_field, page, per_page
+        )
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self._send_body(200, body, etag)
+    
+    def _handle_upcoming(self, params):
+        """앞으로 N일 안의 청약 일정 응답"""
+        def param(name, default=None):
+            return params.get(name, [default])[0] or default
+        
+        try:
+            days = int(param('days', 7))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= 366:
+            self._send_json(400, {'error': "days는 1~366 사이의 정수여야 합니다."})
+            return
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        events = self.index.schedule.upcoming(days, param('주택유형'), param('공급지역'), start=today)
+        self._send_json(200, {
+            'from': today,
+            'days': days,
+            'total': len(events),
+            'events': [{
+                'date': date,
+                'event': SCHEDULE_FIELDS[field],
+                '주택명': self.index.records[row].get('주택명'),
+                '주택유형': self.index.records[row].get('주택유형'),
+                '공급지역': self.index.records[row].get('공급지역'),
+                '주택관리번호': self.index.records[row].get('주택관리번호'),
+                '모집공고 상세 URL': self.index.records[row].get('모집공고 상세 URL'),
+            } for date, row, field in events]
+        })
+    
+    def _send_json(self, status, payload):
+        self._send_body(status, dumps_json(payload))
+    
+    def _send_body(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve_dataset(output_folder, host='127.0.0.1', port=8000, data_path=None):
+    """
+    수집된 청약정보를 한 번 읽어 인덱싱한 뒤 HTTP 조회 API로 제공
+    
+    Args:
+        output_folder (str): 최신 청약정보 JSON을 찾을 결과 폴더
+        data_path (str, optional): 직접 지정한 데이터 파일 (JSON 또는 백필 JSONL)
+    """
+    data_path = data_path or find_latest_snapshot(output_folder)
+    if not data_path or not os.path.exists(data_path):
+        print(f"❌ 제공할 청약정보 파일이 없습니다: {data_path or output_folder}")
+        print("💡 먼저 청약정보를 수집하거나 --data로 파일을 지정해주세요.")
+        return
+    
+    print(f"📂 데이터 로드 중: {data_path}")
+    index = SubscriptionIndex(load_records(data_path), data_path)
+    print(f"✅ {len(index.records)}건 인덱싱 완료")
+    
+    handler = type('Handler', (SubscriptionRequestHandler,), {'index': index})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"🌐 조회 서버 실행 중: http://{host}:{port}/api/subscriptions")
+    print("⏹️ 종료하려면 Ctrl+C를 누르세요.")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
 ###########################
 # 메인 실행 함수
 ###########################
 
-def main():
+def parse_args(argv=None):
+    """명령행 인자 해석"""
+    parser = argparse.ArgumentParser(description="🏠 부동산 청약정보 수집 프로그램 v3.0")
+    parser.add_argument('--shard', action='store_true',
+                        help="페이지 범위별 작업으로 나누어 여러 워커 프로세스로 수집")
+    parser.add_argument('--workers', type=int, default=2,
+                        help="--shard 모드의 로컬 워커 프로세스 수 (기본: 2)")
+    parser.add_argument('--queue',
+                        help="작업 큐 SQLite 파일 경로 (기본: 결과물/shards/queue_YYYYMMDD.sqlite)")
+    parser.add_argument('--shard-worker', action='store_true',
+                        help="작업 큐의 작업만 처리하고 종료 (다른 호스트에서 실행)")
+    parser.add_argument('--backfill', action='store_true',
+                        help="마감된 청약을 포함한 전체 과거 이력을 수집 (중단 후 재실행 시 이어서 수집)")
+    parser.add_argument('--serve', action='store_true',
+                        help="수집된 청약정보를 HTTP 조회 API로 제공")
+    parser.add_argument('--host', default='127.0.0.1', help="--serve 모드의 바인딩 주소 (기본: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8000, help="--serve 모드의 포트 (기본: 8000)")
+    parser.add_argument('--data', help="--serve 모드에서 제공할 데이터 파일 (기본: 결과 폴더의 최신 JSON)")
+    parser.add_argument('--profile', action='store_true',
+                        help="단계별 cProfile 결과(.prof, 상위 함수 요약)를 결과 폴더에 저장")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="--profile과 함께 tracemalloc 메모리 할당 보고서도 저장 (실행이 느려짐)")
+    parser.add_argument('--profile-top', type=int, default=30,
+                        help="프로파일 요약에 표시할 상위 함수 수 (기본: 30)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """메인 실행 함수"""
+    args = parse_args(argv)
     
     print("🏠 부동산 청약정보 수집 프로그램 v3.0")
     print("=" * 60)
@@ -532,20 +2377,50 @@ def main():
     print("\n⚙️ 2단계: 설정 파일 로드...")
     config = Config()
     
+    if args.serve:
+        print("\n🌐 조회 서버 모드")
+        serve_dataset(config.output_folder, args.host, args.port, args.data)
+        return
+    
     # 3. API 키 검증
     print("\n🔑 3단계: API 키 검증...")
-    if not validate_api_key(config.api_key):
+    if not all(validate_api_key(key) for key in config.api_keys or ['']):
         return
-    print("✅ API 키가 설정되어 있습니다.")
+    print(f"✅ API 키가 설정되어 있습니다. ({len(config.api_keys)}개)")
     
     # 4. 출력 폴더 생성
     print("\n📁 4단계: 출력 폴더 준비...")
     output_folder = create_output_folder(config.output_folder)
+    queue_path = args.queue or os.path.join(
+        output_folder, 'shards', f"queue_{datetime.now().strftime('%Y%m%d')}.sqlite"
+    )
+    profiler = StageProfiler(output_folder, args.profile or args.profile_memory,
+                             args.profile_memory, args.profile_top)
+    
+    if args.shard_worker:
+        print(f"\n🔧 작업 큐 워커 모드: {queue_path}")
+        run_shard_worker(queue_path)
+        return
+    
+    if args.backfill:
+        print("\n📚 전체 이력 백필 모드")
+        with profiler.stage('backfill'):
+            run_backfill(config, output_folder)
+        profiler.write_summary()
+        return
     
     # 5. 데이터 수집
     print("\n📊 5단계: 청약정보 수집...")
+    collector = AsyncHousingCollector.from_config(config) if config.async_collect else None
     try:
-        subscription_data = get_all_housing_data(config.api_key, config.max_pages)
+        with profiler.stage('5_collect'):
+            if args.shard:
+                subscription_data = collect_sharded(config, queue_path, args.workers, config.pages_per_shard)
+            elif collector:
+                subscription_data = asyncio.run(collector.collect(config.max_pages))
+            else:
+                key_pool = ApiKeyPool(config.api_keys, config.daily_quota, config.usage_db)
+                subscription_data = get_all_housing_data(key_pool, config.max_pages)
         
         if not subscription_data:
             print("⚠️ 현재 진행 중인 청약이 없습니다.")
@@ -562,41 +2437,58 @@ def main():
     crawl_notices = input("모집공고문도 크롤링하시겠습니까? (y/N): ").lower().strip()
     
     if crawl_notices == 'y':
-        print("🕷️ 모집공고문 크롤링을 시작합니다...")
-        
-        for i, item in enumerate(subscription_data, 1):
-            notice_url = item.get('모집공고 상세 URL')
-            if notice_url and str(notice_url) != 'N/A':
-                print(f"[{i}/{len(subscription_data)}] 크롤링: {item.get('주택명', '이름없음')}")
-                notice_content = fetch_recruitment_notice_content(notice_url)
-                item['모집공고문_전문'] = notice_content
-                
-                # 진행률 표시
-                print_progress_bar(i, len(subscription_data), prefix='크롤링 진행', suffix='완료')
-                time.sleep(1)  # 서버 부하 방지
+        with profiler.stage('6_crawl'):
+            if collector:
+                print("🕷️ 모집공고문 크롤링을 시작합니다... (비동기 모드)")
+                asyncio.run(collector.crawl_notices(subscription_data))
+                print("\n✅ 모집공고문 크롤링 완료!")
             else:
-                item['모집공고문_전문'] = "URL 없음"
-        
-        print("\n✅ 모집공고문 크롤링 완료!")
+                print("🕷️ 모집공고문 크롤링을 시작합니다...")
+                
+                for i, item in enumerate(subscription_data, 1):
+                    notice_url = item.get('모집공고 상세 URL')
+                    if notice_url and str(notice_url) != 'N/A':
+                        print(f"[{i}/{len(subscription_data)}] 크롤링: {item.get('주택명', '이름없음')}")
+                        notice_content = fetch_recruitment_notice_content(
+                            notice_url, max_chars=config.notice_max_chars
+                        )
+                        item['모집공고문_전문'] = notice_content
+                        
+                        # 진행률 표시
+                        print_progress_bar(i, len(subscription_data), prefix='크롤링 진행', suffix='완료')
+                        time.sleep(1)  # 서버 부하 방지
+                    else:
+                        item['모집공고문_전문'] = "URL 없음"
+                
+                print("\n✅ 모집공고문 크롤링 완료!")
     else:
         print("⏭️ 모집공고문 크롤링을 건너뜁니다.")
     
     # 7. 결과 파일 저장
     print("\n💾 7단계: 결과 파일 생성...")
     current_date = datetime.now().strftime("%Y%m%d")
+    schedule_index = ScheduleIndex(subscription_data)
     
     try:
         # JSON 파일 저장
-        json_filename = os.path.join(output_folder, f"청약정보_{current_date}.json")
-        save_to_json(subscription_data, json_filename)
+        json_filename = os.path.join(output_folder, f"청약정보_{current_date}{json_snapshot_suffix(config)}")
+        with profiler.stage('7_json'):
+            save_to_json(subscription_data, json_filename, pretty=config.json_pretty)
         
         # 엑셀 파일 저장
         excel_filename = os.path.join(output_folder, f"청약정보_{current_date}.xlsx")
-        save_to_excel(subscription_data, excel_filename)
+        with profiler.stage('7_excel'):
+            save_to_excel(subscription_data, excel_filename, schedule_index)
         
         # 마크다운 파일 저장
         md_filename = os.path.join(output_folder, f"청약정보_{current_date}.md")
-        create_detailed_markdown(subscription_data, md_filename)
+        with profiler.stage('7_markdown'):
+            create_detailed_markdown(subscription_data, md_filename, schedule_index)
+        
+        # 청약 일정 캘린더 저장
+        calendar_folder = os.path.join(output_folder, 'calendar')
+        with profiler.stage('7_calendar'):
+            export_ics(schedule_index, calendar_folder)
         
         print("\n" + "=" * 60)
         print("🎉 청약정보 수집이 완료되었습니다!")
@@ -619,9 +2511,13 @@ def main():
         print(f"   📊 {os.path.basename(excel_filename)} - 엑셀 파일")
         print(f"   📝 {os.path.basename(md_filename)} - 마크다운 파일")
         print(f"   🔧 {os.path.basename(json_filename)} - JSON 파일")
+        print(f"   📅 {os.path.basename(calendar_folder)}/ - 청약 일정 캘린더(.ics)")
+        print(f"\n📅 앞으로 7일 안의 청약 일정: {len(schedule_index.upcoming(7))}건")
         
     except Exception as e:
         print(f"❌ 파일 저장 중 오류 발생: {str(e)}")
+    
+    profiler.write_summary()
 
 if __name__ == "__main__":
     try:
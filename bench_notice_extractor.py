@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏠 부동산 청약정보 수집 프로그램 v3.0 - 공고문 추출 벤치마크
+
+기존 방식(전체 텍스트를 만든 뒤 정규식 정리 후 자르기)과
+현재 방식(조각 단위로 정리하며 글자 수 제한에서 멈춤)의
+페이지당 처리 시간과 최대 메모리 사용량을 비교합니다.
+
+실행: python bench_notice_extractor.py
+"""
+
+import re
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from apartment_subscription_collector import NOTICE_MAX_CHARS, extract_notice_text_from_soup
+
+def legacy_extract_from_soup(soup):
+    """기존 fetch_recruitment_notice_content의 텍스트 추출 방식 (비교용)"""
+    content_sections = []
+
+    for table in soup.find_all('table'):
+        table_content = []
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                table_content.append(' | '.join(cell.get_text(strip=True) for cell in cells))
+        if table_content:
+            content_sections.append('\n'.join(table_content))
+
+    for div in soup.find_all('div', class_=['content', 'detail-content', 'notice-content']):
+        text = div.get_text(strip=True)
+        if len(text) > 50:
+            content_sections.append(text)
+
+    full_content = '\n\n'.join(content_sections)
+    if len(full_content) < 200:
+        body = soup.find('body')
+        if body:
+            full_content = body.get_text(separator='\n', strip=True)
+
+    full_content = re.sub(r'\n\s*\n', '\n\n', full_content)
+    full_content = re.sub(r'\s+', ' ', full_content)
+
+    return full_content[:NOTICE_MAX_CHARS]
+
+def build_table_page(tables=200, rows=40):
+    """표가 많은 대형 공고문 페이지"""
+    parts = ['<html><body>']
+    for t in range(tables):
+        parts.append('<table>')
+        for r in range(rows):
+            parts.append(f'<tr><th>항목 {t}-{r}</th><td>공급금액   {r * 1000}원\n\n  (부가세 포함)</td>'
+                         f'<td>  비고  {t}  </td></tr>')
+        parts.append('</table>')
+    parts.append('<div class="content">' + '청약 자격 및 유의사항 안내 ' * 20000 + '</div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+def build_body_page(paragraphs=20000):
+    """표가 없어 body 전체를 사용하는 대형 공고문 페이지"""
+    body = ''.join(f'<p>  제{i}조 모집공고 내용   \n\n 세부 사항 {i}  </p>' for i in range(paragraphs))
+    return f'<html><body>{body}</body></html>'
+
+def measure(func, soup, repeat):
+    """평균 처리 시간(ms)과 최대 메모리 사용량(KB) 측정"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func(soup)
+    elapsed_ms = (time.perf_counter() - started) / repeat * 1000
+
+    tracemalloc.start()
+    func(soup)
+    peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    return result, elapsed_ms, peak_kb
+
+def main():
+    """벤치마크 실행"""
+    pages = {
+        '표 위주 대형 페이지': build_table_page(),
+        'body 대체 대형 페이지': build_body_page(),
+    }
+
+    print("=" * 72)
+    print(f"📏 공고문 추출 벤치마크 (최대 {NOTICE_MAX_CHARS:,}자, HTML 파싱 시간 제외)")
+    print("=" * 72)
+
+    for name, html in pages.items():
+        soup = BeautifulSoup(html, 'html.parser')
+        legacy, legacy_ms, legacy_kb = measure(legacy_extract_from_soup, soup, repeat=5)
+        current, current_ms, current_kb = measure(extract_notice_text_from_soup, soup, repeat=5)
+
+        print(f"\n📄 {name} (HTML {len(html) / 1024 / 1024:.1f} MB)")
+        print(f"   결과 동일 여부: {'✅ 동일' if legacy == current else '❌ 다름'}")
+        print(f"   기존 방식: {legacy_ms:8.1f} ms/페이지, 최대 메모리 {legacy_kb:10.0f} KB")
+        print(f"   현재 방식: {current_ms:8.1f} ms/페이지, 최대 메모리 {current_kb:10.0f} KB")
+
+if __name__ == "__main__":
+    main()